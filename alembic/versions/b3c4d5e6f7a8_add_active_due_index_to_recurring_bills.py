@@ -0,0 +1,32 @@
+"""add_active_due_index_to_recurring_bills
+
+Revision ID: b3c4d5e6f7a8
+Revises: a2b3c4d5e6f7
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3c4d5e6f7a8"  # pragma: allowlist secret
+down_revision: Union[str, Sequence[str], None] = "a2b3c4d5e6f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_recurring_bills_active_due",
+        "recurring_bills",
+        ["is_active", "next_due_date"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_recurring_bills_active_due", table_name="recurring_bills")
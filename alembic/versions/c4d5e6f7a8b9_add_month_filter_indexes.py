@@ -0,0 +1,32 @@
+"""add_month_filter_indexes
+
+Revision ID: c4d5e6f7a8b9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d5e6f7a8b9"  # pragma: allowlist secret
+down_revision: Union[str, Sequence[str], None] = "b3c4d5e6f7a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_transactions_date", "transactions", ["date"])
+    op.create_index("ix_transactions_type_date", "transactions", ["type", "date"])
+    op.create_index("ix_budgets_month_year", "budgets", ["month", "year"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_budgets_month_year", table_name="budgets")
+    op.drop_index("ix_transactions_type_date", table_name="transactions")
+    op.drop_index("ix_transactions_date", table_name="transactions")
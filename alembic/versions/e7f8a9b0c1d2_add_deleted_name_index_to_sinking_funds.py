@@ -0,0 +1,32 @@
+"""add_deleted_name_index_to_sinking_funds
+
+Revision ID: e7f8a9b0c1d2
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7f8a9b0c1d2"  # pragma: allowlist secret
+down_revision: Union[str, Sequence[str], None] = "c4d5e6f7a8b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_sinking_funds_deleted_name",
+        "sinking_funds",
+        ["is_deleted", "name"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sinking_funds_deleted_name", table_name="sinking_funds")
@@ -1,7 +1,6 @@
 """Application configuration derived from environment variables."""
 
 import os
+from zoneinfo import ZoneInfo
 
-import pytz
-
-TIMEZONE = pytz.timezone(os.getenv("TIMEZONE", "Australia/Brisbane"))
+TIMEZONE = ZoneInfo(os.getenv("TIMEZONE", "Australia/Brisbane"))
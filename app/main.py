@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.orm import configure_mappers
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from starlette_csrf import CSRFMiddleware
@@ -21,6 +22,7 @@ from app.routes.sinking_funds import router as sinking_funds_router
 from app.routes.spending_history import router as spending_history_router
 from app.routes.transactions import router as transactions_router
 from app.routes.users import router as users_router
+from app.templating import precompile_templates
 
 load_dotenv()
 
@@ -45,6 +47,8 @@ ALLOWED_ORIGINS = [
 async def lifespan(app: FastAPI):
     from app.scheduler import start_scheduler, stop_scheduler
 
+    configure_mappers()
+    precompile_templates()
     start_scheduler()
     yield
     stop_scheduler()
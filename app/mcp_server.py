@@ -108,7 +108,7 @@ def get_transaction(transaction_id: int) -> dict | str:
     """
     db = SessionLocal()
     try:
-        txn = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        txn = db.get(Transaction, transaction_id)
         if not txn:
             return f"Transaction {transaction_id} not found."
         return TransactionResponse.model_validate(txn).model_dump(mode="json")
@@ -167,7 +167,7 @@ def create_transaction(
     db = SessionLocal()
     try:
         # Verify category exists
-        cat = db.query(Category).filter(Category.id == category_id).first()
+        cat = db.get(Category, category_id)
         if not cat:
             return f"Category {category_id} not found."
 
@@ -261,7 +261,7 @@ def update_transaction(
 
     db = SessionLocal()
     try:
-        txn = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        txn = db.get(Transaction, transaction_id)
         if not txn:
             return f"Transaction {transaction_id} not found."
 
@@ -297,7 +297,7 @@ def delete_transaction(transaction_id: int) -> str:
     """
     db = SessionLocal()
     try:
-        txn = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        txn = db.get(Transaction, transaction_id)
         if not txn:
             return f"Transaction {transaction_id} not found."
 
@@ -359,7 +359,7 @@ def get_bill(bill_id: int) -> dict | str:
     """
     db = SessionLocal()
     try:
-        bill = db.query(RecurringBill).filter(RecurringBill.id == bill_id).first()
+        bill = db.get(RecurringBill, bill_id)
         if not bill:
             return f"Bill {bill_id} not found."
         return RecurringBillResponse.model_validate(bill).model_dump(mode="json")
@@ -412,7 +412,7 @@ def create_bill(
 
     db = SessionLocal()
     try:
-        cat = db.query(Category).filter(Category.id == category_id).first()
+        cat = db.get(Category, category_id)
         if not cat:
             return f"Category {category_id} not found."
 
@@ -496,7 +496,7 @@ def update_bill(
 
     db = SessionLocal()
     try:
-        bill = db.query(RecurringBill).filter(RecurringBill.id == bill_id).first()
+        bill = db.get(RecurringBill, bill_id)
         if not bill:
             return f"Bill {bill_id} not found."
 
@@ -533,7 +533,7 @@ def delete_bill(bill_id: int) -> str:
     """
     db = SessionLocal()
     try:
-        bill = db.query(RecurringBill).filter(RecurringBill.id == bill_id).first()
+        bill = db.get(RecurringBill, bill_id)
         if not bill:
             return f"Bill {bill_id} not found."
 
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import ForeignKey, Numeric, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, Numeric, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -48,6 +48,7 @@ class Category(Base):
 
 class SinkingFund(Base):
     __tablename__ = "sinking_funds"
+    __table_args__ = (Index("ix_sinking_funds_deleted_name", "is_deleted", "name"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -69,6 +70,9 @@ class SinkingFund(Base):
 
 class RecurringBill(Base):
     __tablename__ = "recurring_bills"
+    __table_args__ = (
+        Index("ix_recurring_bills_active_due", "is_active", "next_due_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -96,7 +100,10 @@ class RecurringBill(Base):
 
 class Budget(Base):
     __tablename__ = "budgets"
-    __table_args__ = (UniqueConstraint("category_id", "month", "year"),)
+    __table_args__ = (
+        UniqueConstraint("category_id", "month", "year"),
+        Index("ix_budgets_month_year", "month", "year"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     category_id: Mapped[int] = mapped_column(
@@ -116,6 +123,10 @@ class Budget(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_date", "date"),
+        Index("ix_transactions_type_date", "type", "date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     date: Mapped[str] = mapped_column(String(10), nullable=False)
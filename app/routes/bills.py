@@ -16,7 +16,7 @@ from app.schemas import (
     RecurringBillUpdate,
 )
 from app.tasks import advance_due_date
-from app.templating import templates
+from app.templating import render_fragment, templates
 
 router = APIRouter()
 
@@ -76,58 +76,46 @@ def _bill_context(db: Session):
 
 def _render_table_body(request: Request, db: Session) -> str:
     ctx = _bill_context(db)
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "bills.html",
-            {**ctx, "fragment": "table_body"},
-        ).body
-    ).decode()
+    return render_fragment(request, "bills.html", {**ctx, "fragment": "table_body"})
 
 
 def _render_bill_row(request: Request, bill: RecurringBill) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "bills.html",
-            {
-                "bill": bill,
-                "frequency_labels": FREQUENCY_LABELS,
-                "fragment": "bill_row",
-            },
-        ).body
-    ).decode()
+    return render_fragment(
+        request,
+        "bills.html",
+        {
+            "bill": bill,
+            "frequency_labels": FREQUENCY_LABELS,
+            "fragment": "bill_row",
+        },
+    )
 
 
 def _render_edit_row(request: Request, bill: RecurringBill, categories) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "bills.html",
-            {
-                "bill": bill,
-                "categories": categories,
-                "frequency_labels": FREQUENCY_LABELS,
-                "fragment": "edit_row",
-            },
-        ).body
-    ).decode()
+    return render_fragment(
+        request,
+        "bills.html",
+        {
+            "bill": bill,
+            "categories": categories,
+            "frequency_labels": FREQUENCY_LABELS,
+            "fragment": "edit_row",
+        },
+    )
 
 
 def _render_pay_row(request: Request, bill: RecurringBill) -> str:
     today = date.today().isoformat()
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "bills.html",
-            {
-                "bill": bill,
-                "frequency_labels": FREQUENCY_LABELS,
-                "today": today,
-                "fragment": "pay_row",
-            },
-        ).body
-    ).decode()
+    return render_fragment(
+        request,
+        "bills.html",
+        {
+            "bill": bill,
+            "frequency_labels": FREQUENCY_LABELS,
+            "today": today,
+            "fragment": "pay_row",
+        },
+    )
 
 
 def _record_bill_payment(
@@ -1,4 +1,3 @@
-import calendar
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 
@@ -13,7 +12,7 @@ from app.database import get_db
 from app.middleware import get_current_user
 from app.models import Budget, Category, IncomeAllocation
 from app.schemas import BudgetCreate, BudgetResponse, BudgetUpdate
-from app.templating import templates
+from app.templating import MONTH_NAMES, render_fragment, templates
 
 router = APIRouter()
 
@@ -101,7 +100,7 @@ def _budget_context(db: Session, month: int, year: int) -> dict:
         "available_categories": available,
         "month": month,
         "year": year,
-        "month_name": calendar.month_name[month],
+        "month_name": MONTH_NAMES[month],
         "total_allocated": total_allocated,
         "total_spent": total_spent,
         "total_remaining": total_remaining,
@@ -116,44 +115,24 @@ def _budget_context(db: Session, month: int, year: int) -> dict:
 
 def _render_table_body(request: Request, db: Session, month: int, year: int) -> str:
     ctx = _budget_context(db, month, year)
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "budgets.html",
-            {**ctx, "fragment": "table_body"},
-        ).body
-    ).decode()
+    return render_fragment(request, "budgets.html", {**ctx, "fragment": "table_body"})
 
 
 def _render_summary_bar(request: Request, db: Session, month: int, year: int) -> str:
     ctx = _budget_context(db, month, year)
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "budgets.html",
-            {**ctx, "fragment": "summary_bar"},
-        ).body
-    ).decode()
+    return render_fragment(request, "budgets.html", {**ctx, "fragment": "summary_bar"})
 
 
 def _render_budget_row(request: Request, budget: Budget) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "budgets.html",
-            {"budget": budget, "fragment": "budget_row"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "budgets.html", {"budget": budget, "fragment": "budget_row"}
+    )
 
 
 def _render_edit_row(request: Request, budget: Budget) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "budgets.html",
-            {"budget": budget, "fragment": "edit_row"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "budgets.html", {"budget": budget, "fragment": "edit_row"}
+    )
 
 
 # ---------------------------------------------------------------------------
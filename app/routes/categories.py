@@ -9,7 +9,7 @@ from app.database import get_db
 from app.middleware import get_current_user
 from app.models import Category
 from app.schemas import CategoryCreate, CategoryResponse, CategoryUpdate
-from app.templating import templates
+from app.templating import render_fragment, templates
 
 _COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
 
@@ -27,33 +27,21 @@ def _active_categories(db: Session):
 
 def _render_table_body(request: Request, db: Session) -> str:
     categories = _active_categories(db)
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "categories.html",
-            {"categories": categories, "fragment": "table_body"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "categories.html", {"categories": categories, "fragment": "table_body"}
+    )
 
 
 def _render_category_row(request: Request, category: Category) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "categories.html",
-            {"cat": category, "fragment": "category_row"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "categories.html", {"cat": category, "fragment": "category_row"}
+    )
 
 
 def _render_edit_row(request: Request, category: Category) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "categories.html",
-            {"cat": category, "fragment": "edit_row"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "categories.html", {"cat": category, "fragment": "edit_row"}
+    )
 
 
 # ---------------------------------------------------------------------------
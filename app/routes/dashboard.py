@@ -6,14 +6,15 @@ from decimal import Decimal, InvalidOperation
 from fastapi import APIRouter, Depends, Form, Request
 
 from app.config import TIMEZONE
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, Response
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session, joinedload
 
 from app.database import get_db
 from app.middleware import get_current_user
 from app.models import Budget, MonthlyUnallocatedIncome, SinkingFund, Transaction
 from app.schemas import DashboardSummary, SinkingFundResponse, TransactionResponse
-from app.templating import templates
+from app.templating import MONTH_NAMES, templates
 
 router = APIRouter()
 
@@ -29,31 +30,49 @@ def _dashboard_data(db: Session, month: int, year: int) -> dict:
     last_day = calendar.monthrange(year, month)[1]
     end = f"{year:04d}-{month:02d}-{last_day:02d}"
 
-    # Transactions for the month
-    transactions = (
-        db.query(Transaction)
-        .options(
-            joinedload(Transaction.category),
-            joinedload(Transaction.sinking_fund),
-            joinedload(Transaction.recurring_bill),
-            joinedload(Transaction.budget),
+    # Income/expense totals, row count and unallocated income in a single query
+    unallocated_amount = (
+        db.query(MonthlyUnallocatedIncome.unallocated_amount)
+        .filter(
+            MonthlyUnallocatedIncome.month == month,
+            MonthlyUnallocatedIncome.year == year,
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
+    income_sum, expense_sum, txn_count, unallocated_sum = (
+        db.query(
+            func.sum(case((Transaction.type == "income", Transaction.amount), else_=0)),
+            func.sum(
+                case((Transaction.type == "expense", Transaction.amount), else_=0)
+            ),
+            func.count(Transaction.id),
+            unallocated_amount,
         )
         .filter(Transaction.date >= start, Transaction.date <= end)
-        .order_by(Transaction.date.desc(), Transaction.id.desc())
-        .all()
+        .one()
     )
-
-    total_income = sum(
-        (Decimal(str(t.amount)) for t in transactions if t.type == "income"),
-        Decimal("0"),
-    ).quantize(Decimal("0.01"))
-    total_expenses = sum(
-        (Decimal(str(t.amount)) for t in transactions if t.type == "expense"),
-        Decimal("0"),
-    ).quantize(Decimal("0.01"))
+    total_income = Decimal(str(income_sum or 0)).quantize(Decimal("0.01"))
+    total_expenses = Decimal(str(expense_sum or 0)).quantize(Decimal("0.01"))
     net = (total_income - total_expenses).quantize(Decimal("0.01"))
-
-    recent_transactions = transactions[:10]
+    unallocated_income = Decimal(str(unallocated_sum or 0)).quantize(Decimal("0.01"))
+
+    # Skip the recent-transactions query for a month with nothing in it
+    recent_transactions = []
+    if txn_count:
+        recent_transactions = (
+            db.query(Transaction)
+            .options(
+                joinedload(Transaction.category),
+                joinedload(Transaction.sinking_fund),
+                joinedload(Transaction.recurring_bill),
+                joinedload(Transaction.budget),
+            )
+            .filter(Transaction.date >= start, Transaction.date <= end)
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+            .limit(10)
+            .all()
+        )
 
     # Budget totals for the month
     budgets = (
@@ -82,21 +101,6 @@ def _dashboard_data(db: Session, month: int, year: int) -> dict:
         .all()
     )
 
-    # Unallocated income
-    unallocated_row = (
-        db.query(MonthlyUnallocatedIncome)
-        .filter(
-            MonthlyUnallocatedIncome.month == month,
-            MonthlyUnallocatedIncome.year == year,
-        )
-        .first()
-    )
-    unallocated_income = (
-        Decimal(str(unallocated_row.unallocated_amount)).quantize(Decimal("0.01"))
-        if unallocated_row
-        else Decimal("0.00")
-    )
-
     # Total net worth: sinking fund balances + unallocated income + budget remaining
     total_sinking_funds = sum(
         (Decimal(str(sf.current_balance)) for sf in sinking_funds),
@@ -136,7 +140,7 @@ def _dashboard_data(db: Session, month: int, year: int) -> dict:
         "recent_transactions": recent_transactions,
         "month": month,
         "year": year,
-        "month_name": calendar.month_name[month],
+        "month_name": MONTH_NAMES[month],
         "budget_daily_remaining": budget_daily_remaining,
         "days_remaining": days_remaining,
     }
@@ -278,4 +282,5 @@ async def api_dashboard(
             TransactionResponse.model_validate(t) for t in data["recent_transactions"]
         ],
     )
-    return JSONResponse(summary.model_dump(mode="json"))
+    # Serialize in pydantic-core rather than via a dict and stdlib json
+    return Response(summary.model_dump_json(), media_type="application/json")
@@ -1,9 +1,10 @@
 from decimal import Decimal, InvalidOperation
 
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
 
 from app.database import get_db
 from app.middleware import get_current_user
@@ -23,6 +24,18 @@ from app.templating import templates
 router = APIRouter()
 
 
+def _get_allocation(db: Session) -> IncomeAllocation | None:
+    """Load the single IncomeAllocation row with its child collections."""
+    return (
+        db.query(IncomeAllocation)
+        .options(
+            selectinload(IncomeAllocation.sinking_fund_allocations),
+            selectinload(IncomeAllocation.recurring_transfers),
+        )
+        .first()
+    )
+
+
 def _upsert_allocation(
     db: Session,
     monthly_income_amount: Decimal,
@@ -63,14 +76,19 @@ def _upsert_allocation(
             IncomeAllocationToSinkingFund.income_allocation_id == allocation.id
         ).delete()
 
-    # Insert new junction rows
-    for fa in fund_allocations:
-        junction = IncomeAllocationToSinkingFund(
-            income_allocation_id=allocation.id,
-            sinking_fund_id=fa["sinking_fund_id"],
-            allocation_amount=fa["allocation_amount"],
+    # Insert new junction rows in a single executemany
+    if fund_allocations:
+        db.execute(
+            insert(IncomeAllocationToSinkingFund),
+            [
+                {
+                    "income_allocation_id": allocation.id,
+                    "sinking_fund_id": fa["sinking_fund_id"],
+                    "allocation_amount": fa["allocation_amount"],
+                }
+                for fa in fund_allocations
+            ],
         )
-        db.add(junction)
 
     # Replace recurring transfers
     allocation.recurring_transfers = [
@@ -89,7 +107,7 @@ def _upsert_allocation(
 @router.get("/income", response_class=HTMLResponse)
 async def income_page(request: Request, db: Session = Depends(get_db)):
     user = get_current_user(request)
-    allocation = db.query(IncomeAllocation).first()
+    allocation = _get_allocation(db)
     sinking_funds = (
         db.query(SinkingFund).filter(SinkingFund.is_deleted == False).all()  # noqa: E712
     )
@@ -212,10 +230,11 @@ async def income_save(request: Request, db: Session = Depends(get_db)):
 
 @router.get("/api/income")
 async def api_get_income(request: Request, db: Session = Depends(get_db)):
-    allocation = db.query(IncomeAllocation).first()
+    allocation = _get_allocation(db)
     if not allocation:
         return JSONResponse({"detail": "No income allocation found"}, status_code=404)
-    return IncomeAllocationResponse.model_validate(allocation)
+    response = IncomeAllocationResponse.model_validate(allocation)
+    return Response(response.model_dump_json(), media_type="application/json")
 
 
 @router.post("/api/income")
@@ -256,4 +275,8 @@ async def api_post_income(request: Request, db: Session = Depends(get_db)):
 
     response = IncomeAllocationResponse.model_validate(allocation)
     status_code = 201 if created else 200
-    return JSONResponse(response.model_dump(mode="json"), status_code=status_code)
+    return Response(
+        response.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
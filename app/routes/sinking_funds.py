@@ -2,21 +2,25 @@ import calendar
 import re
 from datetime import date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
+from typing import Literal
 
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import ValidationError
-from sqlalchemy.orm import Session, joinedload
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session, joinedload, load_only
 
 from app.config import TIMEZONE
 from app.database import get_db
 from app.middleware import get_current_user
 from app.models import RecurringBill, SinkingFund, Transaction
 from app.schemas import SinkingFundCreate, SinkingFundResponse, SinkingFundUpdate
-from app.templating import templates
+from app.templating import MONTH_NAMES, render_fragment, templates
 
 _COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
 
+_FUND_LIST_ADAPTER = TypeAdapter(list[SinkingFundResponse])
+
 router = APIRouter()
 
 FREQUENCY_ANNUAL_MULTIPLIER = {
@@ -27,56 +31,69 @@ FREQUENCY_ANNUAL_MULTIPLIER = {
 }
 
 
-def _active_funds(db: Session):
+def _active_funds(db: Session, *options):
     return (
         db.query(SinkingFund)
+        .options(*options)
         .filter(SinkingFund.is_deleted == False)  # noqa: E712
         .order_by(SinkingFund.name)
         .all()
     )
 
 
-def _compute_bills_recommended(db: Session) -> Decimal:
-    bills = (
-        db.query(RecurringBill)
+def _bill_totals(db: Session) -> tuple[Decimal, Decimal]:
+    """Return the recommended monthly Bills allocation and the bills due in 30 days.
+
+    Both come from one query over active bills, grouped by frequency so the
+    annualising multipliers are still applied in Decimal.
+    """
+    today = date.today()
+    cutoff = today + timedelta(days=30)
+    due_soon = case(
+        (
+            RecurringBill.next_due_date.between(today.isoformat(), cutoff.isoformat()),
+            RecurringBill.amount,
+        ),
+        else_=0,
+    )
+    rows = (
+        db.query(
+            RecurringBill.frequency,
+            func.sum(RecurringBill.amount),
+            func.sum(due_soon),
+        )
         .filter(RecurringBill.is_active == True)  # noqa: E712
+        .group_by(RecurringBill.frequency)
         .all()
     )
     total_annual = sum(
         (
-            Decimal(str(b.amount))
-            * Decimal(str(FREQUENCY_ANNUAL_MULTIPLIER.get(b.frequency, 1)))
-            for b in bills
+            Decimal(str(amount))
+            * Decimal(str(FREQUENCY_ANNUAL_MULTIPLIER.get(frequency, 1)))
+            for frequency, amount, _ in rows
         ),
         Decimal("0"),
     )
-    return (total_annual / 12).quantize(Decimal("0.01"))
-
-
-def _bills_due_next_30_days(db: Session) -> Decimal:
-    today = date.today()
-    cutoff = today + timedelta(days=30)
-    today_str = today.isoformat()
-    cutoff_str = cutoff.isoformat()
-    bills = (
-        db.query(RecurringBill)
-        .filter(
-            RecurringBill.is_active == True,  # noqa: E712
-            RecurringBill.next_due_date >= today_str,
-            RecurringBill.next_due_date <= cutoff_str,
-        )
-        .all()
-    )
-    return sum((Decimal(str(b.amount)) for b in bills), Decimal("0"))
+    due_30 = sum((Decimal(str(due or 0)) for _, _, due in rows), Decimal("0"))
+    return (total_annual / 12).quantize(Decimal("0.01")), due_30
 
 
 def _fund_context(db: Session):
-    funds = _active_funds(db)
+    # The list page only renders these columns; skip the timestamps
+    funds = _active_funds(
+        db,
+        load_only(
+            SinkingFund.name,
+            SinkingFund.description,
+            SinkingFund.current_balance,
+            SinkingFund.color,
+            SinkingFund.is_system,
+        ),
+    )
     total_balance = sum(
         (Decimal(str(f.current_balance)) for f in funds), Decimal("0")
     ).quantize(Decimal("0.01"))
-    bills_recommended = _compute_bills_recommended(db)
-    bills_due_30 = _bills_due_next_30_days(db)
+    bills_recommended, bills_due_30 = _bill_totals(db)
 
     # Find the Bills fund to check buffer warning
     bills_fund = next((f for f in funds if f.name == "Bills"), None)
@@ -93,41 +110,51 @@ def _fund_context(db: Session):
     }
 
 
+def _soft_delete_fund(
+    db: Session, fund_id: int
+) -> Literal["deleted", "missing", "system"]:
+    """Soft-delete a non-system fund with a single UPDATE ... RETURNING.
+
+    The fund is only loaded when nothing was updated, to tell a missing
+    fund apart from a system one.
+    """
+    deleted = db.execute(
+        update(SinkingFund)
+        .where(SinkingFund.id == fund_id, SinkingFund.is_system == False)  # noqa: E712
+        .values(is_deleted=True)
+        .returning(SinkingFund.id)
+    ).first()
+    if deleted is None:
+        return "missing" if db.get(SinkingFund, fund_id) is None else "system"
+    db.commit()
+    return "deleted"
+
+
 def _render_table_body(request: Request, db: Session) -> str:
     ctx = _fund_context(db)
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "sinking_funds.html",
-            {**ctx, "fragment": "table_body"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "sinking_funds.html", {**ctx, "fragment": "table_body"}
+    )
 
 
 def _render_fund_row(
     request: Request, fund: SinkingFund, bills_recommended: Decimal = Decimal("0")
 ) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "sinking_funds.html",
-            {
-                "fund": fund,
-                "bills_recommended": bills_recommended,
-                "fragment": "fund_row",
-            },
-        ).body
-    ).decode()
+    return render_fragment(
+        request,
+        "sinking_funds.html",
+        {
+            "fund": fund,
+            "bills_recommended": bills_recommended,
+            "fragment": "fund_row",
+        },
+    )
 
 
 def _render_edit_row(request: Request, fund: SinkingFund) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "sinking_funds.html",
-            {"fund": fund, "fragment": "edit_row"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "sinking_funds.html", {"fund": fund, "fragment": "edit_row"}
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -215,7 +242,7 @@ async def sinking_funds_update(
     db.commit()
     db.refresh(fund)
 
-    bills_recommended = _compute_bills_recommended(db)
+    bills_recommended, _ = _bill_totals(db)
     return HTMLResponse(_render_fund_row(request, fund, bills_recommended))
 
 
@@ -223,16 +250,14 @@ async def sinking_funds_update(
 async def sinking_funds_delete(
     request: Request, fund_id: int, db: Session = Depends(get_db)
 ):
-    fund = db.query(SinkingFund).filter(SinkingFund.id == fund_id).first()
-    if not fund:
+    outcome = _soft_delete_fund(db, fund_id)
+    if outcome == "missing":
         return HTMLResponse("Not found", status_code=404)
-    if fund.is_system:
+    if outcome == "system":
         return HTMLResponse(
             '<p class="text-red-600 text-sm">System sinking funds cannot be deleted.</p>',
             status_code=400,
         )
-    fund.is_deleted = True
-    db.commit()
     return HTMLResponse("")
 
 
@@ -311,7 +336,7 @@ async def sinking_fund_detail(
             "transactions": transactions,
             "month": month,
             "year": year,
-            "month_name": calendar.month_name[month],
+            "month_name": MONTH_NAMES[month],
             "prev_month": prev_month,
             "prev_year": prev_year,
             "next_month": next_month,
@@ -331,9 +356,11 @@ async def sinking_fund_detail(
 @router.get("/api/sinking-funds")
 async def api_list_funds(request: Request, db: Session = Depends(get_db)):
     funds = _active_funds(db)
-    return [
-        SinkingFundResponse.model_validate(f).model_dump(mode="json") for f in funds
-    ]
+    # Validate and serialize the whole list in pydantic-core
+    body = _FUND_LIST_ADAPTER.dump_json(
+        _FUND_LIST_ADAPTER.validate_python(funds, from_attributes=True)
+    )
+    return Response(body, media_type="application/json")
 
 
 @router.post("/api/sinking-funds")
@@ -407,13 +434,11 @@ async def api_update_fund(
 async def api_delete_fund(
     request: Request, fund_id: int, db: Session = Depends(get_db)
 ):
-    fund = db.query(SinkingFund).filter(SinkingFund.id == fund_id).first()
-    if not fund:
+    outcome = _soft_delete_fund(db, fund_id)
+    if outcome == "missing":
         return JSONResponse({"detail": "Sinking fund not found"}, status_code=404)
-    if fund.is_system:
+    if outcome == "system":
         return JSONResponse(
             {"detail": "System sinking funds cannot be deleted."}, status_code=400
         )
-    fund.is_deleted = True
-    db.commit()
     return JSONResponse({"detail": "Sinking fund deleted"}, status_code=200)
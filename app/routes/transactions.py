@@ -14,7 +14,7 @@ from app.database import get_db
 from app.middleware import get_current_user
 from app.models import Budget, Category, RecurringBill, SinkingFund, Transaction
 from app.schemas import TransactionCreate, TransactionResponse, TransactionUpdate
-from app.templating import templates
+from app.templating import MONTH_NAMES, render_fragment, templates
 
 router = APIRouter()
 
@@ -206,7 +206,7 @@ def _transaction_context(
         "transaction_type_labels": TRANSACTION_TYPE_LABELS,
         "month": month,
         "year": year,
-        "month_name": calendar.month_name[month],
+        "month_name": MONTH_NAMES[month],
         "total_income": total_income,
         "total_expenses": total_expenses,
         "net": net,
@@ -267,27 +267,21 @@ def _render_table_body(
     page: int = 1,
 ) -> str:
     ctx = _transaction_context(db, month, year, type_filter, category_filter, page=page)
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "transactions.html",
-            {**ctx, "fragment": "table_body"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "transactions.html", {**ctx, "fragment": "table_body"}
+    )
 
 
 def _render_transaction_row(request: Request, txn: Transaction) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "transactions.html",
-            {
-                "txn": txn,
-                "transaction_type_labels": TRANSACTION_TYPE_LABELS,
-                "fragment": "transaction_row",
-            },
-        ).body
-    ).decode()
+    return render_fragment(
+        request,
+        "transactions.html",
+        {
+            "txn": txn,
+            "transaction_type_labels": TRANSACTION_TYPE_LABELS,
+            "fragment": "transaction_row",
+        },
+    )
 
 
 def _render_edit_row(request: Request, txn: Transaction, db: Session) -> str:
@@ -300,21 +294,19 @@ def _render_edit_row(request: Request, txn: Transaction, db: Session) -> str:
     except ValueError, IndexError:
         pass
 
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "transactions.html",
-            {
-                "txn": txn,
-                "categories": _all_categories(db),
-                "sinking_funds": _active_sinking_funds(db),
-                "recurring_bills": _active_recurring_bills(db),
-                "budgets": _budgets_for_month_dropdown(db, month_val, year_val),
-                "transaction_type_labels": TRANSACTION_TYPE_LABELS,
-                "fragment": "edit_row",
-            },
-        ).body
-    ).decode()
+    return render_fragment(
+        request,
+        "transactions.html",
+        {
+            "txn": txn,
+            "categories": _all_categories(db),
+            "sinking_funds": _active_sinking_funds(db),
+            "recurring_bills": _active_recurring_bills(db),
+            "budgets": _budgets_for_month_dropdown(db, month_val, year_val),
+            "transaction_type_labels": TRANSACTION_TYPE_LABELS,
+            "fragment": "edit_row",
+        },
+    )
 
 
 # ---------------------------------------------------------------------------
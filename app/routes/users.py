@@ -8,7 +8,7 @@ from app.database import get_db
 from app.middleware import get_current_user
 from app.models import User
 from app.schemas import UserCreate, UserResponse, UserUpdate
-from app.templating import templates
+from app.templating import render_fragment, templates
 
 router = APIRouter()
 
@@ -20,38 +20,30 @@ def _all_users(db: Session) -> list[User]:
 def _render_table_body(request: Request, db: Session) -> str:
     users = _all_users(db)
     current_user = get_current_user(request)
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "users.html",
-            {
-                "users": users,
-                "current_user_id": current_user.id,
-                "fragment": "table_body",
-            },
-        ).body
-    ).decode()
+    return render_fragment(
+        request,
+        "users.html",
+        {
+            "users": users,
+            "current_user_id": current_user.id,
+            "fragment": "table_body",
+        },
+    )
 
 
 def _render_user_row(request: Request, user: User) -> str:
     current_user = get_current_user(request)
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "users.html",
-            {"user": user, "current_user_id": current_user.id, "fragment": "user_row"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request,
+        "users.html",
+        {"user": user, "current_user_id": current_user.id, "fragment": "user_row"},
+    )
 
 
 def _render_edit_row(request: Request, user: User) -> str:
-    return bytes(
-        templates.TemplateResponse(
-            request,
-            "users.html",
-            {"user": user, "fragment": "edit_row"},
-        ).body
-    ).decode()
+    return render_fragment(
+        request, "users.html", {"user": user, "fragment": "edit_row"}
+    )
 
 
 # ---------------------------------------------------------------------------
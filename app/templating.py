@@ -1,7 +1,13 @@
+import calendar
+
+from fastapi import Request
 from fastapi.templating import Jinja2Templates
 
 templates = Jinja2Templates(directory="app/templates")
 
+# calendar.month_name runs strftime on every lookup; resolve the names once.
+MONTH_NAMES: tuple[str, ...] = tuple(calendar.month_name)
+
 
 def _money_format(value) -> str:
     """Format a number with commas and 2 decimal places (e.g. 10,000.00)."""
@@ -12,3 +18,14 @@ def _money_format(value) -> str:
 
 
 templates.env.filters["money"] = _money_format
+
+
+def render_fragment(request: Request, name: str, context: dict) -> str:
+    """Render *name* straight to a string for an HTMX fragment response."""
+    return templates.env.get_template(name).render({"request": request, **context})
+
+
+def precompile_templates() -> None:
+    """Compile every template into the Jinja cache so no request pays for it."""
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
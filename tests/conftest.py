@@ -1,9 +1,12 @@
 import os
+from contextlib import contextmanager
+from datetime import datetime
+from html.parser import HTMLParser
 from unittest.mock import patch
 
 import bcrypt as _bcrypt
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -19,6 +22,7 @@ os.environ["SECURE_COOKIES"] = "false"
 
 
 from app.auth import hash_password  # noqa: E402
+from app.config import TIMEZONE  # noqa: E402
 from app.database import Base, get_db  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models import Budget, Category, RecurringBill, SinkingFund, Transaction, User  # noqa: E402
@@ -34,7 +38,30 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+# pysqlite's own transaction handling defers BEGIN and breaks SAVEPOINTs;
+# hand transaction control to SQLAlchemy so nested transactions work.
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# Every session joins one long-lived outer transaction via a SAVEPOINT, so
+# commits inside a test (or inside the app) are undone when the test's own
+# SAVEPOINT is rolled back.
+connection = engine.connect()
+TestingSessionLocal = sessionmaker(
+    bind=connection,
+    autocommit=False,
+    autoflush=False,
+    join_transaction_mode="create_savepoint",
+)
 
 # Redirect all direct SessionLocal references to our test engine.
 # These modules use `from app.database import SessionLocal` (local reference),
@@ -44,12 +71,99 @@ _app_mcp.SessionLocal = TestingSessionLocal
 _app_tasks.SessionLocal = TestingSessionLocal
 
 
+def assert_contains_all(body, needles):
+    """Assert every needle appears in body, listing all that are missing."""
+    missing = [n for n in needles if n not in body]
+    assert not missing, f"missing from response body: {missing}"
+
+
+class _SelectOptionsParser(HTMLParser):
+    def __init__(self, select_id):
+        super().__init__()
+        self.select_id = select_id
+        self.in_select = False
+        self.in_option = False
+        self.options = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "select" and dict(attrs).get("id") == self.select_id:
+            self.in_select = True
+        elif tag == "option" and self.in_select:
+            self.in_option = True
+            self.options.append("")
+
+    def handle_endtag(self, tag):
+        if tag == "select":
+            self.in_select = False
+        elif tag == "option":
+            self.in_option = False
+
+    def handle_data(self, data):
+        if self.in_option:
+            self.options[-1] += data
+
+
+def select_options(html, select_id):
+    """Return the option labels of the <select id=select_id> in html."""
+    parser = _SelectOptionsParser(select_id)
+    parser.feed(html)
+    return [option.strip() for option in parser.options]
+
+
+class _TbodyRowsParser(HTMLParser):
+    def __init__(self, tbody_id):
+        super().__init__()
+        self.tbody_id = tbody_id
+        self.in_tbody = False
+        self.rows = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tbody" and dict(attrs).get("id") == self.tbody_id:
+            self.in_tbody = True
+        elif tag == "tr" and self.in_tbody:
+            self.rows += 1
+
+    def handle_endtag(self, tag):
+        if tag == "tbody":
+            self.in_tbody = False
+
+
+def tbody_row_count(html, tbody_id):
+    """Count the <tr> rows inside the <tbody id=tbody_id> in html."""
+    parser = _TbodyRowsParser(tbody_id)
+    parser.feed(html)
+    return parser.rows
+
+
+class _ElementAttrsParser(HTMLParser):
+    def __init__(self, tag):
+        super().__init__()
+        self.tag = tag
+        self.elements = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == self.tag:
+            self.elements.append(dict(attrs))
+
+
+def element_attrs(html, tag):
+    """Return the attribute dicts of every <tag> element in html, in order."""
+    parser = _ElementAttrsParser(tag)
+    parser.feed(html)
+    return parser.elements
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_schema():
-    """Create the database schema once for the entire test session."""
-    Base.metadata.create_all(bind=engine)
+    """Create the schema and open the outer transaction for the session."""
+    Base.metadata.create_all(bind=connection)
+    connection.commit()
+    outer = connection.begin()
     yield
-    Base.metadata.drop_all(bind=engine)
+    outer.rollback()
+    Base.metadata.drop_all(bind=connection)
+    connection.commit()
+    connection.close()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -69,20 +183,60 @@ def disable_scheduler():
 
 @pytest.fixture(scope="session")
 def _app_client(setup_schema, disable_scheduler):
-    """Session-scoped TestClient: the app (and scheduler) starts once."""
+    """Session-scoped TestClient: the app (and scheduler) starts once.
+
+    Redirects are not followed, so the unauthenticated-redirect tests can
+    check the 303 and its Location header without passing a flag per call.
+    """
     from starlette.testclient import TestClient
 
-    with TestClient(app) as c:
+    with TestClient(app, follow_redirects=False) as c:
         yield c
 
 
 @pytest.fixture(autouse=True)
 def setup_database(setup_schema):
-    """Delete all rows after each test to ensure isolation between tests."""
+    """Roll back everything a test wrote by undoing its SAVEPOINT."""
+    savepoint = connection.begin_nested()
     yield
-    with engine.begin() as conn:
-        for table in reversed(Base.metadata.sorted_tables):
-            conn.execute(table.delete())
+    savepoint.rollback()
+
+
+@contextmanager
+def seed_session():
+    """Session for module-scoped seed data that outlives each test.
+
+    Its commits land in a SAVEPOINT opened before any test's own, so every
+    test in the module sees the rows; the SAVEPOINT is rolled back when the
+    block exits. Use from a module-scoped fixture and yield inside the block.
+    """
+    savepoint = connection.begin_nested()
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        savepoint.rollback()
+
+
+@contextmanager
+def count_selects():
+    """Collect the SELECT statements sent to the test database in the block.
+
+    Yields a list that fills as statements run, so a test can bound the
+    number of queries a request makes and see which ones ran on failure.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
 
 
 @pytest.fixture
@@ -109,109 +263,250 @@ def client(db_session, _app_client):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="session")
+def _alice_password_hash():
+    """Hash alice's password once; bcrypt dominates per-test user setup."""
+    return hash_password("SecurePass123!")
+
+
 @pytest.fixture
-def test_user(db_session):
+def test_user(db_session, _alice_password_hash):
     user = User(
         username="alice",
-        password_hash=hash_password("SecurePass123!"),
+        password_hash=_alice_password_hash,
         email="alice@example.com",
     )
     db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+    db_session.flush()
     return user
 
 
+@pytest.fixture(scope="session")
+def _csrf_token(_app_client):
+    """Fetch a CSRF token once for the whole session.
+
+    The token is signed with the app secret and isn't tied to a login
+    session, so every test can reuse it instead of GETting a page to
+    receive a fresh cookie.
+    """
+    _app_client.get("/login")
+    token = _app_client.cookies.get("csrftoken")
+    _app_client.cookies.clear()
+    return token
+
+
+@pytest.fixture(scope="session")
+def _session_cookies():
+    """Signed login cookies from earlier tests, keyed by (user id, version)."""
+    return {}
+
+
 @pytest.fixture
-def authed_client(client, test_user):
-    # Log in
-    client.post("/login", data={"username": "alice", "password": "SecurePass123!"})
-    # GET a page to receive the CSRF cookie
-    client.get("/income")
-    # Extract CSRF token from cookie
-    csrf_token = None
-    for cookie in client.cookies.jar:
-        if cookie.name == "csrftoken":
-            csrf_token = cookie.value
-            break
-    client.csrf_token = csrf_token
+def authed_client(client, test_user, _csrf_token, _session_cookies):
+    """Client logged in as alice, reusing a cached session cookie.
+
+    The cookie only carries user_id and session_version, both of which
+    are identical for every freshly inserted test_user, so only the first
+    test to see a given user id pays for the /login round trip.
+    """
+    client.cookies.set("csrftoken", _csrf_token)
+    cookie = _session_cookies.get((test_user.id, test_user.session_version))
+    if cookie is None:
+        client.post("/login", data={"username": "alice", "password": "SecurePass123!"})
+        _session_cookies[(test_user.id, test_user.session_version)] = (
+            client.cookies.get("session")
+        )
+    else:
+        client.cookies.set("session", cookie)
+    client.csrf_token = _csrf_token
+    client.csrf_headers = {"x-csrftoken": _csrf_token}
     return client
 
 
+@pytest.fixture(scope="module")
+def fetch_page(_app_client, _alice_password_hash):
+    """GET a page once as a logged-in user, for module-scoped cached responses.
+
+    ``fetch_page(path, seed=fn)`` seeds a user plus whatever ``fn(session)``
+    adds, logs in, fetches *path* and rolls all of it back before returning
+    the response, so read-only tests can share one render.
+    """
+
+    def fetch(path, seed=None):
+        with seed_session() as session:
+            session.add(
+                User(
+                    username="alice",
+                    password_hash=_alice_password_hash,
+                    email="alice@example.com",
+                )
+            )
+            if seed is not None:
+                seed(session)
+            session.commit()
+
+            def override_get_db():
+                yield session
+
+            app.dependency_overrides[get_db] = override_get_db
+            _app_client.cookies.clear()
+            try:
+                _app_client.post(
+                    "/login", data={"username": "alice", "password": "SecurePass123!"}
+                )
+                return _app_client.get(path)
+            finally:
+                _app_client.cookies.clear()
+                app.dependency_overrides.clear()
+
+    return fetch
+
+
+@pytest.fixture(scope="session")
+def current_month_year():
+    """(month, year) of now in the app timezone, computed once per run."""
+    now = datetime.now(TIMEZONE)
+    return now.month, now.year
+
+
 @pytest.fixture
-def sample_sinking_funds(db_session):
-    funds = [
-        SinkingFund(name="Bills", color="#FF0000", current_balance=0),
-        SinkingFund(name="Savings", color="#00FF00", current_balance=0),
-    ]
-    db_session.add_all(funds)
-    db_session.commit()
-    for f in funds:
-        db_session.refresh(f)
-    return funds
+def make_sinking_funds(db_session):
+    """Bulk insert SinkingFund rows from dicts and return them in order."""
+
+    def make(rows):
+        return _bulk_insert(db_session, SinkingFund, rows)
+
+    return make
 
 
 @pytest.fixture
-def sample_category(db_session):
-    cat = Category(
-        name="Bills", type="expense", color="#FF0000", is_budget_category=False
+def sample_sinking_funds(make_sinking_funds):
+    return make_sinking_funds(
+        [
+            {"name": "Bills", "color": "#FF0000", "current_balance": 0},
+            {"name": "Savings", "color": "#00FF00", "current_balance": 0},
+        ]
     )
-    db_session.add(cat)
-    db_session.commit()
-    db_session.refresh(cat)
-    return cat
+
+
+@pytest.fixture(scope="module")
+def _seeded_category(setup_schema):
+    """Insert the read-only "Bills" category once per module."""
+    with seed_session() as session:
+        cat = Category(
+            name="Bills", type="expense", color="#FF0000", is_budget_category=False
+        )
+        session.add(cat)
+        session.commit()
+        yield cat.id
+
+
+@pytest.fixture
+def sample_category(db_session, _seeded_category):
+    return db_session.get(Category, _seeded_category)
+
+
+@pytest.fixture(scope="module")
+def _seeded_bills(_seeded_category):
+    """Insert the Rent/Internet bills once per module."""
+    with seed_session() as session:
+        bills = [
+            RecurringBill(
+                name="Rent",
+                amount=2400,
+                debtor_provider="Landlord",
+                start_date="2026-01-01",
+                frequency="monthly",
+                category_id=_seeded_category,
+                next_due_date="2026-02-01",
+            ),
+            RecurringBill(
+                name="Internet",
+                amount=89,
+                debtor_provider="ISP",
+                start_date="2026-01-01",
+                frequency="monthly",
+                category_id=_seeded_category,
+                next_due_date="2026-02-01",
+            ),
+        ]
+        session.add_all(bills)
+        session.commit()
+        yield [b.id for b in bills]
 
 
 @pytest.fixture
-def sample_bills(db_session, sample_category):
-    bills = [
-        RecurringBill(
-            name="Rent",
-            amount=2400,
-            debtor_provider="Landlord",
-            start_date="2026-01-01",
-            frequency="monthly",
-            category_id=sample_category.id,
-            next_due_date="2026-02-01",
-        ),
-        RecurringBill(
-            name="Internet",
-            amount=89,
-            debtor_provider="ISP",
-            start_date="2026-01-01",
-            frequency="monthly",
-            category_id=sample_category.id,
-            next_due_date="2026-02-01",
-        ),
+def sample_bills(db_session, sample_category, _seeded_bills):
+    # Mutations made through db_session are undone with the test's SAVEPOINT.
+    return [db_session.get(RecurringBill, bill_id) for bill_id in _seeded_bills]
+
+
+# Seed rows are built once at import time and bulk-inserted per test.
+_BUDGET_CATEGORY_ROWS = [
+    {
+        "name": "Groceries",
+        "type": "expense",
+        "color": "#22C55E",
+        "is_budget_category": True,
+    },
+    {
+        "name": "Transport",
+        "type": "expense",
+        "color": "#3B82F6",
+        "is_budget_category": True,
+    },
+    {
+        "name": "Entertainment",
+        "type": "expense",
+        "color": "#F59E0B",
+        "is_budget_category": True,
+    },
+]
+
+
+def _bulk_insert(session, model, rows):
+    """Insert *rows* with one INSERT ... RETURNING, commit, and return them."""
+    objs = session.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True), rows
+    ).all()
+    session.commit()
+    return objs
+
+
+def make_budget_categories():
+    """Unsaved Groceries/Transport/Entertainment budget categories."""
+    return [Category(**row) for row in _BUDGET_CATEGORY_ROWS]
+
+
+def _budget_rows(categories, month, year):
+    return [
+        {
+            "category_id": categories[0].id,  # Groceries
+            "month": month,
+            "year": year,
+            "allocated_amount": 600,
+            "spent_amount": 150,
+            "fund_balance": 0,
+        },
+        {
+            "category_id": categories[1].id,  # Transport
+            "month": month,
+            "year": year,
+            "allocated_amount": 200,
+            "spent_amount": 80,
+            "fund_balance": 0,
+        },
     ]
-    db_session.add_all(bills)
-    db_session.commit()
-    for b in bills:
-        db_session.refresh(b)
-    return bills
+
+
+def make_budgets(categories, month, year):
+    """Unsaved budgets for the first two of *categories* in month/year."""
+    return [Budget(**row) for row in _budget_rows(categories, month, year)]
 
 
 @pytest.fixture
 def sample_budget_categories(db_session):
-    cats = [
-        Category(
-            name="Groceries", type="expense", color="#22C55E", is_budget_category=True
-        ),
-        Category(
-            name="Transport", type="expense", color="#3B82F6", is_budget_category=True
-        ),
-        Category(
-            name="Entertainment",
-            type="expense",
-            color="#F59E0B",
-            is_budget_category=True,
-        ),
-    ]
-    db_session.add_all(cats)
-    db_session.commit()
-    for c in cats:
-        db_session.refresh(c)
-    return cats
+    return _bulk_insert(db_session, Category, _BUDGET_CATEGORY_ROWS)
 
 
 @pytest.fixture
@@ -227,60 +522,31 @@ def sample_income_category(db_session):
 
 @pytest.fixture
 def sample_transactions(db_session, sample_category, sample_income_category):
-    txns = [
-        Transaction(
-            date="2026-01-15",
-            description="Groceries shopping",
-            amount=75.50,
-            category_id=sample_category.id,
-            type="expense",
-            transaction_type="regular",
-        ),
-        Transaction(
-            date="2026-01-01",
-            description="Monthly income",
-            amount=5000.00,
-            category_id=sample_income_category.id,
-            type="income",
-            transaction_type="income",
-        ),
+    rows = [
+        {
+            "date": "2026-01-15",
+            "description": "Groceries shopping",
+            "amount": 75.50,
+            "category_id": sample_category.id,
+            "type": "expense",
+            "transaction_type": "regular",
+        },
+        {
+            "date": "2026-01-01",
+            "description": "Monthly income",
+            "amount": 5000.00,
+            "category_id": sample_income_category.id,
+            "type": "income",
+            "transaction_type": "income",
+        },
     ]
-    db_session.add_all(txns)
-    db_session.commit()
-    for t in txns:
-        db_session.refresh(t)
-    return txns
+    return _bulk_insert(db_session, Transaction, rows)
 
 
 @pytest.fixture
-def sample_budgets(db_session, sample_budget_categories):
-    from datetime import datetime
-
-    from app.config import TIMEZONE
-
-    now = datetime.now(TIMEZONE)
-    month, year = now.month, now.year
-
-    budgets = [
-        Budget(
-            category_id=sample_budget_categories[0].id,  # Groceries
-            month=month,
-            year=year,
-            allocated_amount=600,
-            spent_amount=150,
-            fund_balance=0,
-        ),
-        Budget(
-            category_id=sample_budget_categories[1].id,  # Transport
-            month=month,
-            year=year,
-            allocated_amount=200,
-            spent_amount=80,
-            fund_balance=0,
-        ),
-    ]
-    db_session.add_all(budgets)
-    db_session.commit()
-    for b in budgets:
-        db_session.refresh(b)
-    return budgets
+def sample_budgets(db_session, sample_budget_categories, current_month_year):
+    return _bulk_insert(
+        db_session,
+        Budget,
+        _budget_rows(sample_budget_categories, *current_month_year),
+    )
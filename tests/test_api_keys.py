@@ -11,7 +11,7 @@ class TestCreateApiKey:
         resp = authed_client.post(
             "/api/keys",
             json={"name": "my-key"},
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 201
         data = resp.json()
@@ -26,7 +26,7 @@ class TestCreateApiKey:
         resp = authed_client.post(
             "/api/keys",
             json={},
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 201
         assert resp.json()["api_key"]["name"] == "default"
@@ -35,7 +35,7 @@ class TestCreateApiKey:
         """Should work even without a JSON body (falls back to defaults)."""
         resp = authed_client.post(
             "/api/keys",
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 201
 
@@ -54,7 +54,7 @@ class TestCreateApiKey:
         resp = authed_client.post(
             "/api/keys",
             json={"name": "one-too-many"},
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 429
         assert "Maximum" in resp.json()["detail"]
@@ -74,7 +74,7 @@ class TestCreateApiKey:
         resp = authed_client.post(
             "/api/keys",
             json={"name": "second-today"},
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 429
         assert "24-hour" in resp.json()["detail"]
@@ -99,7 +99,7 @@ class TestCreateApiKey:
         resp = authed_client.post(
             "/api/keys",
             json={"name": "fresh"},
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 201
 
@@ -132,7 +132,7 @@ class TestRevokeApiKey:
 
         resp = authed_client.delete(
             f"/api/keys/{api_key.id}",
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 200
         assert "revoked" in resp.json()["detail"].lower()
@@ -143,7 +143,7 @@ class TestRevokeApiKey:
     def test_revoke_nonexistent(self, authed_client):
         resp = authed_client.delete(
             "/api/keys/9999",
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 404
 
@@ -160,7 +160,7 @@ class TestRevokeApiKey:
 
         resp = authed_client.delete(
             f"/api/keys/{api_key.id}",
-            headers={"X-CSRF-Token": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 400
         assert "already revoked" in resp.json()["detail"].lower()
@@ -186,7 +186,7 @@ class TestApiKeysHtmlPage:
         resp = authed_client.post(
             "/api-keys",
             data={"name": "form-key"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 200
         # Should contain the plaintext key for copying
@@ -198,7 +198,7 @@ class TestApiKeysHtmlPage:
         resp = authed_client.post(
             "/api-keys",
             data={},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 200
         assert "default" in resp.text
@@ -211,7 +211,7 @@ class TestApiKeysHtmlPage:
 
         resp = authed_client.delete(
             f"/api-keys/{api_key.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 200
         assert resp.text == ""
@@ -233,7 +233,7 @@ class TestApiKeysHtmlPage:
         resp = authed_client.post(
             "/api-keys",
             data={"name": "too-soon"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 200
         assert "24-hour" in resp.text
@@ -252,7 +252,7 @@ class TestApiKeysHtmlPage:
         resp = authed_client.post(
             "/api-keys",
             data={"name": "one-too-many"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert resp.status_code == 200
         assert "Maximum" in resp.text
@@ -13,7 +13,7 @@ class TestLoginPage:
             data={"username": "alice", "password": "SecurePass123!"},
         )
         # Visit login page again
-        response = client.get("/login", follow_redirects=False)
+        response = client.get("/login")
         assert response.status_code == 303
         assert response.headers["location"] == "/"
 
@@ -72,7 +72,7 @@ class TestLogout:
             data={"username": "alice", "password": "SecurePass123!"},
         )
         # Logout via POST (non-HTMX)
-        response = client.post("/logout", follow_redirects=False)
+        response = client.post("/logout")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -83,16 +83,16 @@ class TestLogout:
             data={"username": "alice", "password": "SecurePass123!"},
         )
         # Logout via POST
-        client.post("/logout", follow_redirects=False)
+        client.post("/logout")
         # Try to access protected route
-        response = client.get("/", follow_redirects=False)
+        response = client.get("/")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
 
 class TestProtectedRoutes:
     def test_unauthenticated_redirect(self, client):
-        response = client.get("/", follow_redirects=False)
+        response = client.get("/")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -107,6 +107,6 @@ class TestProtectedRoutes:
             data={"username": "alice", "password": "SecurePass123!"},
         )
         # Access login page should redirect (session persists)
-        response = client.get("/login", follow_redirects=False)
+        response = client.get("/login")
         assert response.status_code == 303
         assert response.headers["location"] == "/"
@@ -1,27 +1,60 @@
+from decimal import Decimal
+
 import pytest
+from sqlalchemy import select
 
 from app.models import RecurringBill, SinkingFund, Transaction
 from app.tasks import process_due_bills
+from tests.conftest import assert_contains_all, seed_session
+
+
+@pytest.fixture
+def posted_bill_form(authed_client, sample_bills):
+    """POST a new monthly bill through the HTML form and return the response."""
+    return authed_client.post(
+        "/bills",
+        data={
+            "name": "Power",
+            "debtor_provider": "Energy Co",
+            "amount": "150.00",
+            "frequency": "monthly",
+            "start_date": "2026-01-01",
+            "next_due_date": "2026-02-01",
+        },
+        headers=authed_client.csrf_headers,
+    )
+
+
+@pytest.fixture
+def posted_quarterly_bill_form(authed_client, sample_bills):
+    """POST a new quarterly bill through the HTML form and return the response."""
+    return authed_client.post(
+        "/bills",
+        data={
+            "name": "Water",
+            "debtor_provider": "Water Co",
+            "amount": "60.00",
+            "frequency": "quarterly",
+            "start_date": "2026-01-01",
+            "next_due_date": "2026-04-01",
+        },
+        headers=authed_client.csrf_headers,
+    )
 
 
 class TestBillsPageGet:
     def test_renders_page_with_table(self, authed_client):
         response = authed_client.get("/bills")
         assert response.status_code == 200
-        assert "Recurring Bills" in response.text
-        assert "Name" in response.text
-        assert "Provider" in response.text
-        assert "Amount" in response.text
-        assert "Frequency" in response.text
-        assert "Next Due" in response.text
+        assert_contains_all(
+            response.text,
+            {"Recurring Bills", "Name", "Provider", "Amount", "Frequency", "Next Due"},
+        )
 
     def test_lists_active_bills(self, authed_client, sample_bills):
         response = authed_client.get("/bills")
         assert response.status_code == 200
-        assert "Rent" in response.text
-        assert "Internet" in response.text
-        assert "Landlord" in response.text
-        assert "ISP" in response.text
+        assert_contains_all(response.text, {"Rent", "Internet", "Landlord", "ISP"})
 
     def test_excludes_inactive_bills(self, authed_client, db_session, sample_bills):
         sample_bills[0].is_active = False
@@ -33,65 +66,38 @@ class TestBillsPageGet:
 
     def test_shows_add_form(self, authed_client):
         response = authed_client.get("/bills")
-        assert "Add New Bill" in response.text
-        assert 'name="name"' in response.text
-        assert 'name="amount"' in response.text
+        assert_contains_all(
+            response.text, {"Add New Bill", 'name="name"', 'name="amount"'}
+        )
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/bills", follow_redirects=False)
+        response = client.get("/bills")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
 
 class TestBillsPagePost:
-    def test_creates_new_bill(self, authed_client, db_session, sample_category):
-        response = authed_client.post(
-            "/bills",
-            data={
-                "name": "Power",
-                "debtor_provider": "Energy Co",
-                "amount": "150.00",
-                "frequency": "monthly",
-                "start_date": "2026-01-01",
-                "next_due_date": "2026-02-01",
-            },
-            headers={"x-csrftoken": authed_client.csrf_token},
-        )
-        assert response.status_code == 200
+    def test_creates_new_bill(self, posted_bill_form, db_session, sample_category):
+        assert posted_bill_form.status_code == 200
         bill = (
             db_session.query(RecurringBill)
             .filter(RecurringBill.name == "Power")
             .first()
         )
         assert bill is not None
-        assert float(bill.amount) == 150.0
+        assert bill.amount == Decimal("150.00")
         assert bill.category_id == sample_category.id
 
-    def test_returns_updated_table_body(
-        self, authed_client, sample_category, sample_bills
-    ):
-        response = authed_client.post(
-            "/bills",
-            data={
-                "name": "Water",
-                "debtor_provider": "Water Co",
-                "amount": "60.00",
-                "frequency": "quarterly",
-                "start_date": "2026-01-01",
-                "next_due_date": "2026-04-01",
-            },
-            headers={"x-csrftoken": authed_client.csrf_token},
-        )
-        assert response.status_code == 200
-        assert "Water" in response.text
+    def test_returns_updated_table_body(self, posted_quarterly_bill_form):
+        assert posted_quarterly_bill_form.status_code == 200
         # Existing bills should also be in the refreshed table body
-        assert "Rent" in response.text
+        assert_contains_all(posted_quarterly_bill_form.text, {"Water", "Rent"})
 
     def test_error_on_missing_required_fields(self, authed_client):
         response = authed_client.post(
             "/bills",
             data={"name": "", "debtor_provider": "", "amount": "100"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "required" in response.text.lower()
@@ -107,7 +113,7 @@ class TestBillsPagePost:
                 "start_date": "2026-01-01",
                 "next_due_date": "2026-02-01",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Invalid amount" in response.text
@@ -132,9 +138,14 @@ class TestBillsEditGet:
         bill = sample_bills[0]
         response = authed_client.get(f"/bills/{bill.id}/edit")
         assert response.status_code == 200
-        assert f'value="{bill.name}"' in response.text
-        assert f'value="{bill.debtor_provider}"' in response.text
-        assert 'name="amount"' in response.text
+        assert_contains_all(
+            response.text,
+            {
+                f'value="{bill.name}"',
+                f'value="{bill.debtor_provider}"',
+                'name="amount"',
+            },
+        )
 
     def test_404_for_nonexistent_bill(self, authed_client):
         response = authed_client.get("/bills/99999/edit")
@@ -153,13 +164,13 @@ class TestBillsEditPost:
                 "frequency": "monthly",
                 "next_due_date": "2026-03-01",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        db_session.refresh(bill)
+        db_session.expire(bill, ["name", "debtor_provider", "amount"])
         assert bill.name == "Updated Rent"
         assert bill.debtor_provider == "New Landlord"
-        assert float(bill.amount) == 2600.0
+        assert bill.amount == Decimal("2600.00")
 
     def test_returns_updated_row(self, authed_client, sample_bills):
         bill = sample_bills[0]
@@ -172,16 +183,15 @@ class TestBillsEditPost:
                 "frequency": "monthly",
                 "next_due_date": "2026-03-01",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
-        assert "Updated Rent" in response.text
-        assert "New Landlord" in response.text
+        assert_contains_all(response.text, {"Updated Rent", "New Landlord"})
 
     def test_404_for_nonexistent_bill(self, authed_client):
         response = authed_client.post(
             "/bills/99999",
             data={"name": "X"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -191,24 +201,24 @@ class TestBillsDelete:
         bill = sample_bills[0]
         response = authed_client.delete(
             f"/bills/{bill.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        db_session.refresh(bill)
+        db_session.expire(bill, ["is_active"])
         assert bill.is_active is False
 
     def test_returns_empty_response(self, authed_client, sample_bills):
         bill = sample_bills[0]
         response = authed_client.delete(
             f"/bills/{bill.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.text == ""
 
     def test_404_for_nonexistent_bill(self, authed_client):
         response = authed_client.delete(
             "/bills/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -238,13 +248,13 @@ class TestApiBillsList:
         assert data[0]["name"] == "Internet"
 
     def test_unauthenticated_redirects(self, client):
-        response = client.get("/api/bills", follow_redirects=False)
+        response = client.get("/api/bills")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
 
 class TestApiBillsCreate:
-    def test_creates_bill_returns_201(self, authed_client, db_session, sample_category):
+    def test_creates_bill_returns_201(self, authed_client, sample_category):
         response = authed_client.post(
             "/api/bills",
             json={
@@ -256,19 +266,19 @@ class TestApiBillsCreate:
                 "category_id": sample_category.id,
                 "next_due_date": "2026-02-01",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
         assert data["name"] == "Gas"
-        assert float(data["amount"]) == 120.50
+        assert Decimal(data["amount"]) == Decimal("120.50")
         assert data["is_active"] is True
 
     def test_422_on_validation_error(self, authed_client):
         response = authed_client.post(
             "/api/bills",
             json={"name": ""},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -309,18 +319,18 @@ class TestApiBillsUpdate:
         response = authed_client.put(
             f"/api/bills/{bill.id}",
             json={"name": "Updated Rent", "amount": "2600"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         data = response.json()
         assert data["name"] == "Updated Rent"
-        assert float(data["amount"]) == 2600.0
+        assert Decimal(data["amount"]) == Decimal("2600.00")
 
     def test_404_for_nonexistent(self, authed_client):
         response = authed_client.put(
             "/api/bills/99999",
             json={"name": "X"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -329,7 +339,7 @@ class TestApiBillsUpdate:
         response = authed_client.put(
             f"/api/bills/{bill.id}",
             json={"amount": "-10"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -339,16 +349,16 @@ class TestApiBillsDelete:
         bill = sample_bills[0]
         response = authed_client.delete(
             f"/api/bills/{bill.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        db_session.refresh(bill)
+        db_session.expire(bill, ["is_active"])
         assert bill.is_active is False
 
     def test_404_for_nonexistent(self, authed_client):
         response = authed_client.delete(
             "/api/bills/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -390,25 +400,29 @@ def variable_bill(db_session, sample_category):
 
 
 class TestBillTypeDefault:
-    def test_default_bill_type_is_fixed(
-        self, authed_client, db_session, sample_category
+    @pytest.mark.parametrize(
+        "bill_type_in,expected",
+        [(None, "fixed"), ("fixed", "fixed"), ("variable", "variable")],
+    )
+    def test_create_bill_type_via_api(
+        self, authed_client, db_session, sample_category, bill_type_in, expected
     ):
-        authed_client.post(
-            "/api/bills",
-            json={
-                "name": "Rent",
-                "amount": "1000",
-                "debtor_provider": "Landlord",
-                "start_date": "2026-01-01",
-                "frequency": "monthly",
-                "category_id": sample_category.id,
-                "next_due_date": "2026-02-01",
-            },
-        )
-        bill = (
-            db_session.query(RecurringBill).filter(RecurringBill.name == "Rent").first()
-        )
-        assert bill.bill_type == "fixed"
+        payload = {
+            "name": "Electricity",
+            "amount": "150",
+            "debtor_provider": "Power Co",
+            "start_date": "2026-01-01",
+            "frequency": "monthly",
+            "category_id": sample_category.id,
+            "next_due_date": "2026-02-01",
+        }
+        if bill_type_in is not None:
+            payload["bill_type"] = bill_type_in
+        response = authed_client.post("/api/bills", json=payload)
+        assert response.status_code == 201
+        data = response.json()
+        assert data["bill_type"] == expected
+        assert db_session.get(RecurringBill, data["id"]).bill_type == expected
 
     def test_bill_type_appears_in_api_response(self, authed_client, sample_bills):
         bill = sample_bills[0]
@@ -418,75 +432,75 @@ class TestBillTypeDefault:
         assert "bill_type" in data
         assert data["bill_type"] == "fixed"
 
-    def test_create_variable_bill_via_api(
-        self, authed_client, db_session, sample_category
-    ):
-        response = authed_client.post(
-            "/api/bills",
-            json={
-                "name": "Electricity",
-                "amount": "150",
-                "debtor_provider": "Power Co",
-                "start_date": "2026-01-01",
-                "frequency": "monthly",
-                "category_id": sample_category.id,
-                "next_due_date": "2026-02-01",
-                "bill_type": "variable",
-            },
-        )
-        assert response.status_code == 201
-        data = response.json()
-        assert data["bill_type"] == "variable"
-
 
-class TestProcessDueBillsVariableSkip:
-    def test_variable_bill_skipped_by_scheduler(
-        self, db_session, bills_fund, variable_bill
-    ):
-        original_due = variable_bill.next_due_date
-        process_due_bills(db=db_session)
-
-        db_session.refresh(variable_bill)
-        db_session.refresh(bills_fund)
-
-        # next_due_date should be unchanged
-        assert variable_bill.next_due_date == original_due
+@pytest.fixture(scope="class")
+def scheduled_state(_seeded_category):
+    """Run process_due_bills once over a fixed and a variable bill.
 
-        # No transaction should have been created
-        txn = (
-            db_session.query(Transaction)
-            .filter(Transaction.recurring_bill_id == variable_bill.id)
-            .first()
-        )
-        assert txn is None
-
-    def test_fixed_bill_still_autopays(self, db_session, sample_category, bills_fund):
+    Returns (fixed_bill_id, variable_bill_id, payments), where payments is
+    the (recurring_bill_id, amount) of every transaction recorded for either
+    bill, read with one IN query. The rows and anything the scheduler wrote
+    stay visible to every test in the class.
+    """
+    with seed_session() as session:
         fixed_bill = RecurringBill(
             name="Rent",
             amount=1000,
             debtor_provider="Landlord",
             start_date="2026-01-01",
             frequency="monthly",
-            category_id=sample_category.id,
+            category_id=_seeded_category,
             next_due_date="2026-02-01",
             bill_type="fixed",
         )
-        db_session.add(fixed_bill)
-        db_session.commit()
-        db_session.refresh(fixed_bill)
+        variable_bill = RecurringBill(
+            name="Electricity",
+            amount=150,
+            debtor_provider="Power Co",
+            start_date="2026-01-01",
+            frequency="monthly",
+            category_id=_seeded_category,
+            next_due_date="2026-02-01",
+            bill_type="variable",
+        )
+        session.add_all(
+            [
+                SinkingFund(name="Bills", color="#FF0000", current_balance=500),
+                fixed_bill,
+                variable_bill,
+            ]
+        )
+        session.commit()
+        bill_ids = (fixed_bill.id, variable_bill.id)
 
-        process_due_bills(db=db_session)
+        process_due_bills(db=session)
+        payments = session.execute(
+            select(Transaction.recurring_bill_id, Transaction.amount).where(
+                Transaction.recurring_bill_id.in_(bill_ids)
+            )
+        ).all()
 
-        db_session.refresh(fixed_bill)
-        db_session.refresh(bills_fund)
+        yield (*bill_ids, payments)
 
-        txn = (
-            db_session.query(Transaction)
-            .filter(Transaction.recurring_bill_id == fixed_bill.id)
-            .first()
-        )
-        assert txn is not None
-        assert float(txn.amount) == 1000.0
+
+@pytest.mark.slow
+@pytest.mark.xdist_group("scheduler")
+class TestProcessDueBillsVariableSkip:
+    def test_variable_bill_skipped_by_scheduler(self, db_session, scheduled_state):
+        variable_bill = db_session.get(RecurringBill, scheduled_state[1])
+
+        # next_due_date should be unchanged
+        assert variable_bill.next_due_date == "2026-02-01"
+
+        # No transaction should have been created
+        payments = scheduled_state[2]
+        assert variable_bill.id not in {bill_id for bill_id, _ in payments}
+
+    def test_fixed_bill_still_autopays(self, db_session, scheduled_state):
+        fixed_bill = db_session.get(RecurringBill, scheduled_state[0])
+
+        payments = scheduled_state[2]
+        assert payments == [(fixed_bill.id, Decimal("1000.00"))]
         # next_due_date should have advanced
         assert fixed_bill.next_due_date != "2026-02-01"
 
@@ -495,9 +509,9 @@ class TestBillsPayFormGet:
     def test_returns_pay_form_for_variable_bill(self, authed_client, variable_bill):
         response = authed_client.get(f"/bills/{variable_bill.id}/pay")
         assert response.status_code == 200
-        assert "Record Payment" in response.text
-        assert 'name="amount"' in response.text
-        assert 'name="date"' in response.text
+        assert_contains_all(
+            response.text, {"Record Payment", 'name="amount"', 'name="date"'}
+        )
 
     def test_404_for_nonexistent_bill(self, authed_client):
         response = authed_client.get("/bills/99999/pay")
@@ -512,7 +526,7 @@ class TestBillsPayPost:
         response = authed_client.post(
             f"/bills/{variable_bill.id}/pay",
             data={"amount": "180.50", "date": "2026-02-21"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
 
@@ -522,29 +536,29 @@ class TestBillsPayPost:
             .first()
         )
         assert txn is not None
-        assert float(txn.amount) == 180.50
+        assert txn.amount == Decimal("180.50")
         assert txn.sinking_fund_id == bills_fund.id
 
-        db_session.refresh(variable_bill)
+        db_session.expire(variable_bill, ["next_due_date"])
         assert variable_bill.next_due_date != original_due
 
     def test_deducts_bills_fund_balance(
         self, authed_client, db_session, variable_bill, bills_fund
     ):
-        original_balance = float(bills_fund.current_balance)
+        original_balance = bills_fund.current_balance
         authed_client.post(
             f"/bills/{variable_bill.id}/pay",
             data={"amount": "100.00", "date": "2026-02-21"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
-        db_session.refresh(bills_fund)
-        assert float(bills_fund.current_balance) == original_balance - 100.00
+        db_session.expire(bills_fund, ["current_balance"])
+        assert bills_fund.current_balance == original_balance - Decimal("100.00")
 
     def test_returns_updated_bill_row(self, authed_client, variable_bill, bills_fund):
         response = authed_client.post(
             f"/bills/{variable_bill.id}/pay",
             data={"amount": "150.00", "date": "2026-02-21"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert variable_bill.name in response.text
@@ -554,7 +568,7 @@ class TestBillsPayPost:
         response = authed_client.post(
             f"/bills/{variable_bill.id}/pay",
             data={"amount": "100.00", "date": "2026-02-21"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Bills sinking fund not found" in response.text
@@ -563,7 +577,7 @@ class TestBillsPayPost:
         response = authed_client.post(
             f"/bills/{variable_bill.id}/pay",
             data={"amount": "abc", "date": "2026-02-21"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Invalid amount" in response.text
@@ -588,7 +602,7 @@ class TestApiBillsPay:
         data = response.json()
         assert "transaction" in data
         assert "bill" in data
-        assert float(data["transaction"]["amount"]) == 200.00
+        assert Decimal(data["transaction"]["amount"]) == Decimal("200.00")
         assert data["bill"]["id"] == variable_bill.id
 
     def test_advances_next_due_date(
@@ -599,7 +613,7 @@ class TestApiBillsPay:
             f"/api/bills/{variable_bill.id}/pay",
             json={"amount": "100", "date": "2026-02-21"},
         )
-        db_session.refresh(variable_bill)
+        db_session.expire(variable_bill, ["next_due_date"])
         assert variable_bill.next_due_date != original_due
 
     def test_404_for_nonexistent_bill(self, authed_client):
@@ -1,85 +1,113 @@
-from datetime import datetime
+import pytest
+from sqlalchemy import select
 
-from app.config import TIMEZONE
 from app.models import Budget
+from tests.conftest import (
+    assert_contains_all,
+    make_budget_categories,
+    make_budgets,
+    select_options,
+)
 
 
-def _current_month_year():
-    now = datetime.now(TIMEZONE)
-    return now.month, now.year
+def _seed_budget_categories(session):
+    session.add_all(make_budget_categories())
+
+
+# Read-only page checks share one render per seeded data set.
+@pytest.fixture(scope="module")
+def budgets_page(fetch_page):
+    return fetch_page("/budgets")
+
+
+@pytest.fixture(scope="module")
+def budgets_page_with_categories(fetch_page):
+    return fetch_page("/budgets", seed=_seed_budget_categories)
+
+
+@pytest.fixture(scope="module")
+def budgets_page_with_budgets(fetch_page, current_month_year):
+    def seed(session):
+        cats = make_budget_categories()
+        session.add_all(cats)
+        session.flush()
+        session.add_all(make_budgets(cats, *current_month_year))
+
+    return fetch_page("/budgets", seed=seed)
 
 
 class TestBudgetsPageGet:
-    def test_renders_page_with_table(self, authed_client):
-        response = authed_client.get("/budgets")
+    def test_renders_page_with_table(self, budgets_page):
+        response = budgets_page
         assert response.status_code == 200
-        assert "Monthly Budget" in response.text
-        assert "Category" in response.text
-        assert "Allocated" in response.text
-        assert "Spent" in response.text
-        assert "Remaining" in response.text
-        assert "Fund Balance" in response.text
-
-    def test_lists_budgets_for_current_month(self, authed_client, sample_budgets):
-        response = authed_client.get("/budgets")
+        assert_contains_all(
+            response.text,
+            {
+                "Monthly Budget",
+                "Category",
+                "Allocated",
+                "Spent",
+                "Remaining",
+                "Fund Balance",
+            },
+        )
+
+    def test_lists_budgets_for_current_month(self, budgets_page_with_budgets):
+        response = budgets_page_with_budgets
         assert response.status_code == 200
-        assert "Groceries" in response.text
-        assert "Transport" in response.text
+        assert_contains_all(response.text, {"Groceries", "Transport"})
 
     def test_month_navigation_links(self, authed_client):
         response = authed_client.get("/budgets?month=6&year=2026")
         assert response.status_code == 200
-        assert "June 2026" in response.text
-        assert "month=5" in response.text  # prev
-        assert "year=2026" in response.text
-        assert "month=7" in response.text  # next
+        assert_contains_all(
+            response.text,
+            {
+                "June 2026",
+                "month=5",  # prev
+                "year=2026",
+                "month=7",  # next
+            },
+        )
 
     def test_month_year_wrapping(self, authed_client):
         # January -> prev should be December of prior year
         response = authed_client.get("/budgets?month=1&year=2026")
-        assert "month=12" in response.text
-        assert "year=2025" in response.text
+        assert_contains_all(response.text, {"month=12", "year=2025"})
 
         # December -> next should be January of next year
         response = authed_client.get("/budgets?month=12&year=2026")
-        assert "month=1" in response.text
-        assert "year=2027" in response.text
+        assert_contains_all(response.text, {"month=1", "year=2027"})
 
     def test_shows_add_form_with_available_categories(
-        self, authed_client, sample_budget_categories
+        self, budgets_page_with_categories
     ):
-        response = authed_client.get("/budgets")
+        response = budgets_page_with_categories
         assert response.status_code == 200
-        assert "Add Budget Category" in response.text
-        assert "Groceries" in response.text
-        assert "Transport" in response.text
-        assert "Entertainment" in response.text
+        assert_contains_all(
+            response.text,
+            {"Add Budget Category", "Groceries", "Transport", "Entertainment"},
+        )
 
-    def test_hides_categories_already_budgeted(self, authed_client, sample_budgets):
-        response = authed_client.get("/budgets")
-        # The dropdown options should only contain Entertainment (not Groceries/Transport)
-        # Groceries and Transport appear in the table rows but not in the select dropdown
-        text = response.text
-        # Count occurrences of category names as option values
-        # Budgeted categories should NOT appear in the select options
-        select_start = text.find('<select id="budget-category"')
-        select_end = text.find("</select>", select_start)
-        select_html = text[select_start:select_end]
-        assert "Entertainment" in select_html
-        assert "Groceries" not in select_html
-        assert "Transport" not in select_html
+    def test_hides_categories_already_budgeted(self, budgets_page_with_budgets):
+        response = budgets_page_with_budgets
+        # Groceries and Transport appear in the table rows but not in the dropdown
+        options = select_options(response.text, "budget-category")
+        assert "Entertainment" in options
+        assert "Groceries" not in options
+        assert "Transport" not in options
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/budgets", follow_redirects=False)
+        response = client.get("/budgets")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
 
 class TestBudgetsPagePost:
     def test_creates_new_budget(
-        self, authed_client, db_session, sample_budget_categories
+        self, authed_client, db_session, sample_budget_categories, current_month_year
     ):
-        month, year = _current_month_year()
+        month, year = current_month_year
         response = authed_client.post(
             "/budgets",
             data={
@@ -88,7 +116,7 @@ class TestBudgetsPagePost:
                 "month": str(month),
                 "year": str(year),
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         budget = (
@@ -104,9 +132,13 @@ class TestBudgetsPagePost:
         assert float(budget.allocated_amount) == 500.0
 
     def test_returns_updated_table_body(
-        self, authed_client, sample_budgets, sample_budget_categories
+        self,
+        authed_client,
+        sample_budgets,
+        sample_budget_categories,
+        current_month_year,
     ):
-        month, year = _current_month_year()
+        month, year = current_month_year
         response = authed_client.post(
             "/budgets",
             data={
@@ -115,14 +147,13 @@ class TestBudgetsPagePost:
                 "month": str(month),
                 "year": str(year),
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        assert "Entertainment" in response.text
-        assert "Groceries" in response.text
+        assert_contains_all(response.text, {"Entertainment", "Groceries"})
 
-    def test_error_on_missing_category(self, authed_client):
-        month, year = _current_month_year()
+    def test_error_on_missing_category(self, authed_client, current_month_year):
+        month, year = current_month_year
         response = authed_client.post(
             "/budgets",
             data={
@@ -131,13 +162,15 @@ class TestBudgetsPagePost:
                 "month": str(month),
                 "year": str(year),
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "required" in response.text.lower()
 
-    def test_error_on_invalid_amount(self, authed_client, sample_budget_categories):
-        month, year = _current_month_year()
+    def test_error_on_invalid_amount(
+        self, authed_client, sample_budget_categories, current_month_year
+    ):
+        month, year = current_month_year
         response = authed_client.post(
             "/budgets",
             data={
@@ -146,15 +179,19 @@ class TestBudgetsPagePost:
                 "month": str(month),
                 "year": str(year),
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Invalid" in response.text
 
     def test_error_on_duplicate_category_month(
-        self, authed_client, sample_budgets, sample_budget_categories
+        self,
+        authed_client,
+        sample_budgets,
+        sample_budget_categories,
+        current_month_year,
     ):
-        month, year = _current_month_year()
+        month, year = current_month_year
         response = authed_client.post(
             "/budgets",
             data={
@@ -165,13 +202,15 @@ class TestBudgetsPagePost:
                 "month": str(month),
                 "year": str(year),
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "already exists" in response.text.lower()
 
-    def test_403_without_csrf(self, authed_client, sample_budget_categories):
-        month, year = _current_month_year()
+    def test_403_without_csrf(
+        self, authed_client, sample_budget_categories, current_month_year
+    ):
+        month, year = current_month_year
         response = authed_client.post(
             "/budgets",
             data={
@@ -189,8 +228,7 @@ class TestBudgetsEditGet:
         budget = sample_budgets[0]
         response = authed_client.get(f"/budgets/{budget.id}/edit")
         assert response.status_code == 200
-        assert 'name="allocated_amount"' in response.text
-        assert "Groceries" in response.text
+        assert_contains_all(response.text, {'name="allocated_amount"', "Groceries"})
 
     def test_404_for_nonexistent_budget(self, authed_client):
         response = authed_client.get("/budgets/99999/edit")
@@ -203,10 +241,10 @@ class TestBudgetsEditPost:
         response = authed_client.post(
             f"/budgets/{budget.id}",
             data={"allocated_amount": "750.00"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        db_session.refresh(budget)
+        budget = db_session.get(Budget, budget.id)
         assert float(budget.allocated_amount) == 750.0
 
     def test_returns_updated_row(self, authed_client, sample_budgets):
@@ -214,7 +252,7 @@ class TestBudgetsEditPost:
         response = authed_client.post(
             f"/budgets/{budget.id}",
             data={"allocated_amount": "750.00"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert "750.00" in response.text
 
@@ -222,7 +260,7 @@ class TestBudgetsEditPost:
         response = authed_client.post(
             "/budgets/99999",
             data={"allocated_amount": "100.00"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -233,26 +271,25 @@ class TestBudgetsDelete:
         budget_id = budget.id
         response = authed_client.delete(
             f"/budgets/{budget_id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        db_session.expire_all()
-        assert db_session.query(Budget).filter(Budget.id == budget_id).first() is None
+        stmt = select(Budget).where(Budget.id == budget_id)
+        assert db_session.execute(stmt).scalar_one_or_none() is None
 
     def test_returns_summary_bar_oob(self, authed_client, sample_budgets):
         budget = sample_budgets[0]
         response = authed_client.delete(
             f"/budgets/{budget.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        assert "budgets-summary-bar" in response.text
-        assert "hx-swap-oob" in response.text
+        assert_contains_all(response.text, {"budgets-summary-bar", "hx-swap-oob"})
 
     def test_404_for_nonexistent_budget(self, authed_client):
         response = authed_client.delete(
             "/budgets/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -263,8 +300,8 @@ class TestBudgetsDelete:
 
 
 class TestApiBudgetsList:
-    def test_returns_json_list(self, authed_client, sample_budgets):
-        month, year = _current_month_year()
+    def test_returns_json_list(self, authed_client, sample_budgets, current_month_year):
+        month, year = current_month_year
         response = authed_client.get(f"/api/budgets?month={month}&year={year}")
         assert response.status_code == 200
         data = response.json()
@@ -278,16 +315,16 @@ class TestApiBudgetsList:
         assert len(data) == 2
 
     def test_unauthenticated_redirects(self, client):
-        response = client.get("/api/budgets", follow_redirects=False)
+        response = client.get("/api/budgets")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
 
 class TestApiBudgetsCreate:
     def test_creates_budget_returns_201(
-        self, authed_client, db_session, sample_budget_categories
+        self, authed_client, db_session, sample_budget_categories, current_month_year
     ):
-        month, year = _current_month_year()
+        month, year = current_month_year
         response = authed_client.post(
             "/api/budgets",
             json={
@@ -296,7 +333,7 @@ class TestApiBudgetsCreate:
                 "year": year,
                 "allocated_amount": "300.00",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
@@ -307,14 +344,18 @@ class TestApiBudgetsCreate:
         response = authed_client.post(
             "/api/budgets",
             json={"category_id": 1},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
     def test_409_on_duplicate(
-        self, authed_client, sample_budgets, sample_budget_categories
+        self,
+        authed_client,
+        sample_budgets,
+        sample_budget_categories,
+        current_month_year,
     ):
-        month, year = _current_month_year()
+        month, year = current_month_year
         response = authed_client.post(
             "/api/budgets",
             json={
@@ -323,13 +364,15 @@ class TestApiBudgetsCreate:
                 "year": year,
                 "allocated_amount": "100.00",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 409
 
-    def test_api_csrf_exempt(self, authed_client, sample_budget_categories):
+    def test_api_csrf_exempt(
+        self, authed_client, sample_budget_categories, current_month_year
+    ):
         """API routes are CSRF-exempt (they use Bearer token auth instead)."""
-        month, year = _current_month_year()
+        month, year = current_month_year
         response = authed_client.post(
             "/api/budgets",
             json={
@@ -362,7 +405,7 @@ class TestApiBudgetsUpdate:
         response = authed_client.put(
             f"/api/budgets/{budget.id}",
             json={"allocated_amount": "800.00"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         data = response.json()
@@ -372,7 +415,7 @@ class TestApiBudgetsUpdate:
         response = authed_client.put(
             "/api/budgets/99999",
             json={"allocated_amount": "100.00"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -381,7 +424,7 @@ class TestApiBudgetsUpdate:
         response = authed_client.put(
             f"/api/budgets/{budget.id}",
             json={"allocated_amount": "-10"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -394,16 +437,16 @@ class TestApiBudgetsDelete:
         budget_id = budget.id
         response = authed_client.delete(
             f"/api/budgets/{budget_id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        db_session.expire_all()
-        assert db_session.query(Budget).filter(Budget.id == budget_id).first() is None
+        stmt = select(Budget).where(Budget.id == budget_id)
+        assert db_session.execute(stmt).scalar_one_or_none() is None
 
     def test_404_for_nonexistent(self, authed_client):
         response = authed_client.delete(
             "/api/budgets/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -414,9 +457,7 @@ class TestBudgetSummary:
         assert response.status_code == 200
         # Groceries: 600 allocated, 150 spent + Transport: 200 allocated, 80 spent
         # Total allocated: 800, total spent: 230, remaining: 570
-        assert "800.00" in response.text
-        assert "230.00" in response.text
-        assert "570.00" in response.text
+        assert_contains_all(response.text, {"800.00", "230.00", "570.00"})
 
     def test_empty_month_shows_zero_totals(self, authed_client):
         # Request a month with no budgets
@@ -64,7 +64,7 @@ class TestCategoriesPageGet:
         assert 'name="color"' in response.text
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/categories", follow_redirects=False)
+        response = client.get("/categories")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -74,7 +74,7 @@ class TestCategoriesPagePost:
         response = authed_client.post(
             "/categories",
             data={"name": "Entertainment", "type": "expense", "color": "#FF5733"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         cat = (
@@ -94,7 +94,7 @@ class TestCategoriesPagePost:
                 "color": "#FF0000",
                 "is_budget_category": "on",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         cat = db_session.query(Category).filter(Category.name == "Housing").first()
         assert cat is not None
@@ -104,7 +104,7 @@ class TestCategoriesPagePost:
         response = authed_client.post(
             "/categories",
             data={"name": "Transport", "type": "expense", "color": "#00AAFF"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Transport" in response.text
@@ -114,7 +114,7 @@ class TestCategoriesPagePost:
         response = authed_client.post(
             "/categories",
             data={"name": "", "type": "expense", "color": "#FF0000"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "required" in response.text.lower()
@@ -123,7 +123,7 @@ class TestCategoriesPagePost:
         response = authed_client.post(
             "/categories",
             data={"name": "Test", "type": "invalid", "color": "#FF0000"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "income" in response.text.lower()
@@ -134,7 +134,7 @@ class TestCategoriesPagePost:
         response = authed_client.post(
             "/categories",
             data={"name": "Test", "type": "expense", "color": ""},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "required" in response.text.lower()
@@ -143,7 +143,7 @@ class TestCategoriesPagePost:
         response = authed_client.post(
             "/categories",
             data={"name": "Test", "type": "expense", "color": "notacolor"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "hex" in response.text.lower() or "required" in response.text.lower()
@@ -176,7 +176,7 @@ class TestCategoriesEdit:
         response = authed_client.post(
             f"/categories/{cat.id}",
             data={"name": "Food", "type": "expense", "color": "#AABBCC"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Food" in response.text
@@ -196,7 +196,7 @@ class TestCategoriesEdit:
                 "color": cat.color,
                 "is_budget_category": "on",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         db_session.refresh(cat)
         assert cat.is_budget_category is True
@@ -208,7 +208,7 @@ class TestCategoriesEdit:
         authed_client.post(
             f"/categories/{cat.id}",
             data={"name": cat.name, "type": cat.type, "color": cat.color},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         db_session.refresh(cat)
         assert cat.is_budget_category is False
@@ -217,7 +217,7 @@ class TestCategoriesEdit:
         response = authed_client.post(
             "/categories/99999",
             data={"name": "X"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -227,7 +227,7 @@ class TestCategoriesDelete:
         cat = sample_categories[0]
         response = authed_client.delete(
             f"/categories/{cat.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         db_session.refresh(cat)
@@ -237,14 +237,14 @@ class TestCategoriesDelete:
         cat = sample_categories[0]
         response = authed_client.delete(
             f"/categories/{cat.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.text == ""
 
     def test_404_for_nonexistent(self, authed_client):
         response = authed_client.delete(
             "/categories/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -356,7 +356,7 @@ class TestApiCategories:
         assert response.status_code == 404
 
     def test_unauthenticated_redirects(self, client):
-        response = client.get("/api/categories", follow_redirects=False)
+        response = client.get("/api/categories")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -399,7 +399,7 @@ class TestSystemCategoryProtection:
     def test_html_delete_system_returns_400(self, authed_client, system_category):
         response = authed_client.delete(
             f"/categories/{system_category.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 400
         assert "System" in response.text
@@ -409,7 +409,7 @@ class TestSystemCategoryProtection:
     ):
         authed_client.delete(
             f"/categories/{system_category.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         db_session.refresh(system_category)
         assert system_category.is_deleted is False
@@ -418,7 +418,7 @@ class TestSystemCategoryProtection:
         response = authed_client.post(
             "/categories",
             data={"name": "Internal Transfers", "type": "transfer", "color": "#6B7280"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         cat = (
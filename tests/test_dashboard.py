@@ -1,12 +1,8 @@
-from datetime import datetime
+from sqlalchemy import insert
 
-from app.config import TIMEZONE as BRISBANE
-from app.models import Category, MonthlyUnallocatedIncome, Transaction
-
-
-def _current_month_year():
-    now = datetime.now(BRISBANE)
-    return now.month, now.year
+from app.models import Budget, Category, MonthlyUnallocatedIncome, Transaction
+from app.templating import MONTH_NAMES
+from tests.conftest import assert_contains_all, tbody_row_count
 
 
 class TestDashboardPageGet:
@@ -15,70 +11,76 @@ class TestDashboardPageGet:
         assert response.status_code == 200
         assert "Dashboard" in response.text or "Total Income" in response.text
 
-    def test_defaults_to_current_month(self, authed_client):
-        month, year = _current_month_year()
-        import calendar
+    def test_defaults_to_current_month(self, authed_client, current_month_year):
+        month, year = current_month_year
 
-        month_name = calendar.month_name[month]
+        month_name = MONTH_NAMES[month]
         response = authed_client.get("/")
         assert response.status_code == 200
-        assert month_name in response.text
-        assert str(year) in response.text
+        assert_contains_all(response.text, {month_name, str(year)})
 
     def test_financial_summary_with_data(self, authed_client, sample_transactions):
         response = authed_client.get("/?month=1&year=2026")
         assert response.status_code == 200
-        assert "5,000.00" in response.text  # income
-        assert "75.50" in response.text  # expense
-        assert "4,924.50" in response.text  # net
+        assert_contains_all(
+            response.text,
+            {
+                "5,000.00",  # income
+                "75.50",  # expense
+                "4,924.50",  # net
+            },
+        )
 
-    def test_budget_overview(self, authed_client, sample_budgets):
-        month, year = _current_month_year()
+    def test_budget_overview(self, authed_client, sample_budgets, current_month_year):
+        month, year = current_month_year
         response = authed_client.get(f"/?month={month}&year={year}")
         assert response.status_code == 200
-        assert "Budget Overview" in response.text
-        assert "800.00" in response.text  # allocated: 600 + 200
-        assert "230.00" in response.text  # spent: 150 + 80
-        assert "570.00" in response.text  # remaining: 800 - 230
+        assert_contains_all(
+            response.text,
+            {
+                "Budget Overview",
+                "800.00",  # allocated: 600 + 200
+                "230.00",  # spent: 150 + 80
+                "570.00",  # remaining: 800 - 230
+            },
+        )
 
     def test_sinking_funds_list(self, authed_client, sample_sinking_funds):
         response = authed_client.get("/")
         assert response.status_code == 200
-        assert "Bills" in response.text
-        assert "Savings" in response.text
+        assert_contains_all(response.text, {"Bills", "Savings"})
 
     def test_recent_transactions(self, authed_client, sample_transactions):
         response = authed_client.get("/?month=1&year=2026")
         assert response.status_code == 200
-        assert "Groceries shopping" in response.text
-        assert "Monthly income" in response.text
+        assert_contains_all(response.text, {"Groceries shopping", "Monthly income"})
 
     def test_empty_month_shows_zeros(self, authed_client):
         response = authed_client.get("/?month=6&year=2030")
         assert response.status_code == 200
-        assert "0.00" in response.text
-        assert "No transactions this month." in response.text
+        assert_contains_all(response.text, {"0.00", "No transactions this month."})
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/", follow_redirects=False)
+        response = client.get("/")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
     def test_month_year_params(self, authed_client, sample_transactions):
         response = authed_client.get("/?month=1&year=2026")
         assert response.status_code == 200
-        assert "January" in response.text
-        assert "2026" in response.text
+        assert_contains_all(response.text, {"January", "2026"})
 
-    def test_unallocated_income_displayed(self, authed_client, db_session):
-        month, year = _current_month_year()
+    def test_unallocated_income_displayed(
+        self, authed_client, db_session, current_month_year
+    ):
+        month, year = current_month_year
         row = MonthlyUnallocatedIncome(
             month=month,
             year=year,
             unallocated_amount=350.75,
         )
         db_session.add(row)
-        db_session.commit()
+        db_session.flush()
 
         response = authed_client.get(f"/?month={month}&year={year}")
         assert response.status_code == 200
@@ -89,47 +91,56 @@ class TestDashboardPageGet:
             name="Test", type="expense", color="#123456", is_budget_category=False
         )
         db_session.add(cat)
-        db_session.commit()
-        db_session.refresh(cat)
-
-        for i in range(15):
-            txn = Transaction(
-                date=f"2026-03-{(i % 28) + 1:02d}",
-                description=f"txn-{i}",
-                amount=10.00,
-                category_id=cat.id,
-                type="expense",
-                transaction_type="regular",
-            )
-            db_session.add(txn)
-        db_session.commit()
+        db_session.flush()
+
+        db_session.execute(
+            insert(Transaction),
+            [
+                {
+                    "date": f"2026-03-{(i % 28) + 1:02d}",
+                    "description": f"txn-{i}",
+                    "amount": 10.00,
+                    "category_id": cat.id,
+                    "type": "expense",
+                    "transaction_type": "regular",
+                }
+                for i in range(15)
+            ],
+        )
 
         response = authed_client.get("/?month=3&year=2026")
         assert response.status_code == 200
-        # Count transaction rows in the table body
-        # At most 10 rows should appear
-        count = response.text.count("txn-")
-        assert count == 10
+        # At most 10 rows should appear in the recent transactions table
+        assert tbody_row_count(response.text, "recent-transactions-body") == 10
 
 
 class TestQuickExpenseForm:
-    def test_form_renders_when_budgets_exist(self, authed_client, sample_budgets):
-        month, year = _current_month_year()
+    def test_form_renders_when_budgets_exist(
+        self, authed_client, sample_budgets, current_month_year
+    ):
+        month, year = current_month_year
         response = authed_client.get(f"/?month={month}&year={year}")
         assert response.status_code == 200
-        assert "Quick Expense" in response.text
-        assert 'hx-post="/dashboard/quick-expense"' in response.text
-        assert "Groceries" in response.text
-        assert "Transport" in response.text
+        assert_contains_all(
+            response.text,
+            {
+                "Quick Expense",
+                'hx-post="/dashboard/quick-expense"',
+                "Groceries",
+                "Transport",
+            },
+        )
 
     def test_form_hidden_when_no_budgets(self, authed_client):
         response = authed_client.get("/?month=6&year=2030")
         assert response.status_code == 200
         assert 'hx-post="/dashboard/quick-expense"' not in response.text
 
-    def test_successful_submission(self, authed_client, db_session, sample_budgets):
+    def test_successful_submission(
+        self, authed_client, db_session, sample_budgets, current_month_year
+    ):
         budget = sample_budgets[0]  # Groceries, spent=150, allocated=600
-        month, year = _current_month_year()
+        month, year = current_month_year
         response = authed_client.post(
             "/dashboard/quick-expense",
             data={
@@ -139,8 +150,7 @@ class TestQuickExpenseForm:
                 "month": str(month),
                 "year": str(year),
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
-            follow_redirects=False,
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "HX-Redirect" in response.headers
@@ -160,11 +170,11 @@ class TestQuickExpenseForm:
         assert txn.category_id == budget.category_id
 
         # Verify budget spent_amount was incremented
-        db_session.refresh(budget)
+        budget = db_session.get(Budget, budget.id)
         assert float(budget.spent_amount) == 192.50  # 150 + 42.50
 
-    def test_missing_budget_id(self, authed_client, sample_budgets):
-        month, year = _current_month_year()
+    def test_missing_budget_id(self, authed_client, sample_budgets, current_month_year):
+        month, year = current_month_year
         response = authed_client.post(
             "/dashboard/quick-expense",
             data={
@@ -172,13 +182,15 @@ class TestQuickExpenseForm:
                 "amount": "10.00",
                 "date": f"{year}-{month:02d}-15",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Budget is required" in response.text
 
-    def test_invalid_amount_zero(self, authed_client, sample_budgets):
-        month, year = _current_month_year()
+    def test_invalid_amount_zero(
+        self, authed_client, sample_budgets, current_month_year
+    ):
+        month, year = current_month_year
         response = authed_client.post(
             "/dashboard/quick-expense",
             data={
@@ -186,13 +198,15 @@ class TestQuickExpenseForm:
                 "amount": "0",
                 "date": f"{year}-{month:02d}-15",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "greater than zero" in response.text
 
-    def test_invalid_amount_text(self, authed_client, sample_budgets):
-        month, year = _current_month_year()
+    def test_invalid_amount_text(
+        self, authed_client, sample_budgets, current_month_year
+    ):
+        month, year = current_month_year
         response = authed_client.post(
             "/dashboard/quick-expense",
             data={
@@ -200,7 +214,7 @@ class TestQuickExpenseForm:
                 "amount": "abc",
                 "date": f"{year}-{month:02d}-15",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Invalid amount" in response.text
@@ -213,7 +227,7 @@ class TestQuickExpenseForm:
                 "amount": "10.00",
                 "date": "",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "valid date" in response.text
@@ -226,7 +240,7 @@ class TestQuickExpenseForm:
                 "amount": "10.00",
                 "date": "2026-01-15",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Budget not found" in response.text
@@ -239,7 +253,6 @@ class TestQuickExpenseForm:
                 "amount": "10.00",
                 "date": "2026-01-15",
             },
-            follow_redirects=False,
         )
         # CSRF middleware rejects before auth can redirect
         assert response.status_code in (303, 403)
@@ -275,8 +288,8 @@ class TestApiDashboard:
         assert data["total_expenses"] == "75.50"
         assert data["net"] == "4924.50"
 
-    def test_budget_totals(self, authed_client, sample_budgets):
-        month, year = _current_month_year()
+    def test_budget_totals(self, authed_client, sample_budgets, current_month_year):
+        month, year = current_month_year
         response = authed_client.get(f"/api/dashboard?month={month}&year={year}")
         assert response.status_code == 200
         data = response.json()
@@ -299,15 +312,17 @@ class TestApiDashboard:
         data = response.json()
         assert data["unallocated_income"] == "0.00"
 
-    def test_unallocated_income_from_db(self, authed_client, db_session):
-        month, year = _current_month_year()
+    def test_unallocated_income_from_db(
+        self, authed_client, db_session, current_month_year
+    ):
+        month, year = current_month_year
         row = MonthlyUnallocatedIncome(
             month=month,
             year=year,
             unallocated_amount=123.45,
         )
         db_session.add(row)
-        db_session.commit()
+        db_session.flush()
 
         response = authed_client.get(f"/api/dashboard?month={month}&year={year}")
         assert response.status_code == 200
@@ -315,7 +330,7 @@ class TestApiDashboard:
         assert data["unallocated_income"] == "123.45"
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/api/dashboard", follow_redirects=False)
+        response = client.get("/api/dashboard")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -1,24 +1,55 @@
+import json
+import re
+
+import pytest
+from sqlalchemy import func
+
 from app.models import (
     IncomeAllocation,
     IncomeAllocationRecurringTransfer,
     IncomeAllocationToSinkingFund,
-    SinkingFund,
 )
+from tests.conftest import count_selects, element_attrs
+
+_FUND_META_RE = re.compile(r"const FUND_META = (.*);")
+
+
+def _input_values(html):
+    """Map each named <input> in html to its value attribute."""
+    return {
+        attrs["name"]: attrs.get("value")
+        for attrs in element_attrs(html, "input")
+        if "name" in attrs
+    }
+
+
+@pytest.fixture(scope="module")
+def income_page(fetch_page):
+    return fetch_page("/income")
 
 
 class TestIncomePageGet:
-    def test_renders_form_with_expected_inputs(self, authed_client):
-        response = authed_client.get("/income")
-        assert response.status_code == 200
-        assert 'name="monthly_income_amount"' in response.text
-        assert 'name="monthly_budget_allocation"' in response.text
-        assert 'name="bills_fund_allocation_type"' in response.text
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "monthly_income_amount",
+            "monthly_budget_allocation",
+            "bills_fund_allocation_type",
+        ],
+    )
+    def test_renders_form_input(self, income_page, name):
+        assert income_page.status_code == 200
+        assert name in _input_values(income_page.text)
 
     def test_shows_sinking_fund_inputs(self, authed_client, sample_sinking_funds):
-        response = authed_client.get("/income")
+        with count_selects() as selects:
+            response = authed_client.get("/income")
+        # user, allocation, funds
+        assert len(selects) <= 3, selects
         assert response.status_code == 200
+        inputs = _input_values(response.text)
         for fund in sample_sinking_funds:
-            assert f'name="fund_{fund.id}"' in response.text
+            assert f"fund_{fund.id}" in inputs
             assert fund.name in response.text
 
     def test_prefills_values_from_existing_allocation(self, authed_client, db_session):
@@ -29,12 +60,13 @@ class TestIncomePageGet:
             bills_fund_fixed_amount=800,
         )
         db_session.add(alloc)
-        db_session.commit()
+        db_session.flush()
 
         response = authed_client.get("/income")
-        assert "5000" in response.text
-        assert "2000" in response.text
-        assert "800" in response.text
+        inputs = _input_values(response.text)
+        assert float(inputs["monthly_income_amount"]) == 5000
+        assert float(inputs["monthly_budget_allocation"]) == 2000
+        assert float(inputs["bills_fund_fixed_amount"]) == 800
 
     def test_prefills_sinking_fund_allocation_amounts(
         self, authed_client, db_session, sample_sinking_funds
@@ -52,67 +84,68 @@ class TestIncomePageGet:
             allocation_amount=300,
         )
         db_session.add(junction)
-        db_session.commit()
+        db_session.flush()
 
-        response = authed_client.get("/income")
-        assert "300" in response.text
+        with count_selects() as selects:
+            response = authed_client.get("/income")
+        # user, allocation + its two collections, funds; not one per fund
+        assert len(selects) <= 5, selects
+        inputs = _input_values(response.text)
+        assert float(inputs[f"fund_{sample_sinking_funds[0].id}"]) == 300
 
-    def test_shows_message_when_no_sinking_funds(self, authed_client):
-        response = authed_client.get("/income")
-        assert "No active sinking funds" in response.text
+    def test_shows_message_when_no_sinking_funds(self, income_page):
+        assert "No active sinking funds" in income_page.text
 
-    def test_excludes_soft_deleted_sinking_funds(self, authed_client, db_session):
-        active = SinkingFund(name="Active Fund", color="#00FF00", current_balance=0)
-        deleted = SinkingFund(
-            name="Deleted Fund",
-            color="#FF0000",
-            current_balance=0,
-            is_deleted=True,
+    def test_excludes_soft_deleted_sinking_funds(
+        self, authed_client, make_sinking_funds
+    ):
+        make_sinking_funds(
+            [
+                {"name": "Active Fund", "color": "#00FF00", "current_balance": 0},
+                {
+                    "name": "Deleted Fund",
+                    "color": "#FF0000",
+                    "current_balance": 0,
+                    "is_deleted": True,
+                },
+            ]
         )
-        db_session.add_all([active, deleted])
-        db_session.commit()
 
         response = authed_client.get("/income")
         assert "Active Fund" in response.text
         assert "Deleted Fund" not in response.text
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/income", follow_redirects=False)
+        response = client.get("/income")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
-    def test_sankey_container_rendered(self, authed_client):
-        response = authed_client.get("/income")
-        assert response.status_code == 200
-        assert 'id="sankey-chart"' in response.text
+    def test_sankey_container_rendered(self, income_page):
+        ids = {attrs.get("id") for attrs in element_attrs(income_page.text, "div")}
+        assert "sankey-chart" in ids
 
-    def test_d3_scripts_loaded(self, authed_client):
-        response = authed_client.get("/income")
-        assert response.status_code == 200
-        assert "https://d3js.org/d3.v7.min.js" in response.text
-        assert (
-            "https://unpkg.com/d3-sankey@0.12.3/dist/d3-sankey.min.js" in response.text
-        )
+    def test_d3_scripts_loaded(self, income_page):
+        srcs = {attrs.get("src") for attrs in element_attrs(income_page.text, "script")}
+        assert {
+            "https://d3js.org/d3.v7.min.js",
+            "https://unpkg.com/d3-sankey@0.12.3/dist/d3-sankey.min.js",
+        } <= srcs
 
-    def test_fund_metadata_in_page(self, authed_client, db_session):
-        funds = [
-            SinkingFund(
-                name="Emergency",
-                color="#EF4444",
-                current_balance=0,
-            ),
-            SinkingFund(name="Holiday", color="#8B5CF6", current_balance=0),
-        ]
-        db_session.add_all(funds)
-        db_session.commit()
+    def test_fund_metadata_in_page(self, authed_client, make_sinking_funds):
+        make_sinking_funds(
+            [
+                {"name": "Emergency", "color": "#EF4444", "current_balance": 0},
+                {"name": "Holiday", "color": "#8B5CF6", "current_balance": 0},
+            ]
+        )
 
         response = authed_client.get("/income")
         assert response.status_code == 200
-        assert "FUND_META" in response.text
-        assert "Emergency" in response.text
-        assert "Holiday" in response.text
-        assert "#EF4444" in response.text
-        assert "#8B5CF6" in response.text
+        fund_meta = json.loads(_FUND_META_RE.search(response.text).group(1))
+        assert {(f["name"], f["color"]) for f in fund_meta} == {
+            ("Emergency", "#EF4444"),
+            ("Holiday", "#8B5CF6"),
+        }
 
 
 class TestIncomePagePost:
@@ -124,7 +157,7 @@ class TestIncomePagePost:
                 "monthly_budget_allocation": "2000",
                 "bills_fund_allocation_type": "recommended",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "saved successfully" in response.text
@@ -142,7 +175,7 @@ class TestIncomePagePost:
             bills_fund_allocation_type="recommended",
         )
         db_session.add(alloc)
-        db_session.commit()
+        db_session.flush()
 
         # Update via POST
         response = authed_client.post(
@@ -152,16 +185,18 @@ class TestIncomePagePost:
                 "monthly_budget_allocation": "2500",
                 "bills_fund_allocation_type": "recommended",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "saved successfully" in response.text
 
         # Verify upsert (not duplicate)
-        count = db_session.query(IncomeAllocation).count()
+        count, amount = db_session.query(
+            func.count(IncomeAllocation.id),
+            func.max(IncomeAllocation.monthly_income_amount),
+        ).one()
         assert count == 1
-        db_session.refresh(alloc)
-        assert float(alloc.monthly_income_amount) == 6000.0
+        assert float(amount) == 6000.0
 
     def test_saves_sinking_fund_allocations(
         self, authed_client, db_session, sample_sinking_funds
@@ -175,7 +210,7 @@ class TestIncomePagePost:
                 f"fund_{sample_sinking_funds[0].id}": "300",
                 f"fund_{sample_sinking_funds[1].id}": "500",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
 
@@ -203,7 +238,7 @@ class TestIncomePagePost:
                 allocation_amount=300,
             )
         )
-        db_session.commit()
+        db_session.flush()
 
         # Update — only allocate to second fund
         authed_client.post(
@@ -214,7 +249,7 @@ class TestIncomePagePost:
                 "bills_fund_allocation_type": "recommended",
                 f"fund_{sample_sinking_funds[1].id}": "700",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
 
         junctions = db_session.query(IncomeAllocationToSinkingFund).all()
@@ -234,7 +269,7 @@ class TestIncomePagePost:
                 f"fund_{sample_sinking_funds[0].id}": "0",
                 f"fund_{sample_sinking_funds[1].id}": "",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
 
         junctions = db_session.query(IncomeAllocationToSinkingFund).all()
@@ -248,7 +283,7 @@ class TestIncomePagePost:
                 "monthly_budget_allocation": "2000",
                 "bills_fund_allocation_type": "recommended",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Income must be greater than zero" in response.text
@@ -262,7 +297,7 @@ class TestIncomePagePost:
                 "bills_fund_allocation_type": "fixed",
                 "bills_fund_fixed_amount": "",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Fixed amount is required" in response.text
@@ -277,7 +312,7 @@ class TestIncomePagePost:
                 "monthly_budget_allocation": "2000",
                 "bills_fund_allocation_type": "recommended",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         alloc = db_session.query(IncomeAllocation).first()
         assert alloc.bills_fund_fixed_amount is None
@@ -302,7 +337,7 @@ class TestApiGetIncome:
             bills_fund_allocation_type="recommended",
         )
         db_session.add(alloc)
-        db_session.commit()
+        db_session.flush()
 
         response = authed_client.get("/api/income")
         assert response.status_code == 200
@@ -332,7 +367,7 @@ class TestApiGetIncome:
                 allocation_amount=300,
             )
         )
-        db_session.commit()
+        db_session.flush()
 
         response = authed_client.get("/api/income")
         data = response.json()
@@ -343,7 +378,7 @@ class TestApiGetIncome:
         )
 
     def test_unauthenticated_redirects(self, client):
-        response = client.get("/api/income", follow_redirects=False)
+        response = client.get("/api/income")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -357,7 +392,7 @@ class TestApiPostIncome:
                 "monthly_budget_allocation": "2000",
                 "bills_fund_allocation_type": "recommended",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
@@ -370,7 +405,7 @@ class TestApiPostIncome:
             bills_fund_allocation_type="recommended",
         )
         db_session.add(alloc)
-        db_session.commit()
+        db_session.flush()
 
         response = authed_client.post(
             "/api/income",
@@ -379,7 +414,7 @@ class TestApiPostIncome:
                 "monthly_budget_allocation": "2500",
                 "bills_fund_allocation_type": "recommended",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert float(response.json()["monthly_income_amount"]) == 6000.0
@@ -403,7 +438,7 @@ class TestApiPostIncome:
                     }
                 ],
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
@@ -416,7 +451,7 @@ class TestApiPostIncome:
                 "monthly_income_amount": "-1",
                 "monthly_budget_allocation": "2000",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -479,7 +514,7 @@ class TestRecurringTransfersFormPost:
                 "transfer_description_0": "Personal allowance",
                 "transfer_amount_0": "200",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "saved successfully" in response.text
@@ -500,7 +535,7 @@ class TestRecurringTransfersFormPost:
                 "transfer_description_0": "Old transfer",
                 "transfer_amount_0": "100",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
 
         # Second save replaces with different transfer
@@ -513,7 +548,7 @@ class TestRecurringTransfersFormPost:
                 "transfer_description_0": "New transfer",
                 "transfer_amount_0": "250",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
 
         db_session.expire_all()
@@ -536,7 +571,7 @@ class TestRecurringTransfersFormPost:
                 "transfer_description_2": "Also valid",
                 "transfer_amount_2": "50",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
 
         transfers = db_session.query(IncomeAllocationRecurringTransfer).all()
@@ -558,7 +593,7 @@ class TestRecurringTransfersFormPost:
                 amount=200,
             )
         )
-        db_session.commit()
+        db_session.flush()
 
         response = authed_client.get("/income")
         assert response.status_code == 200
@@ -5,10 +5,6 @@ use the shared database session factory. The HTTP-level MCP transport is
 tested implicitly by verifying the /mcp mount exists.
 """
 
-import os
-
-os.environ["DATABASE_URL"] = "sqlite:///./test-glow-worm.db"
-
 from app.mcp_server import (
     create_bill,
     create_transaction,
@@ -21,6 +17,7 @@ from app.mcp_server import (
     update_bill,
     update_transaction,
 )
+from app.models import Transaction
 
 # FastMCP wraps decorated functions into FunctionTool objects.
 # Access the underlying callable via .fn for direct testing.
@@ -74,19 +71,25 @@ class TestTransactionTools:
     def test_list_transactions_with_filters(
         self, db_session, setup_database, sample_category, sample_income_category
     ):
-        _create_transaction(
-            date="2026-01-10",
-            amount=100.00,
-            category_id=sample_category.id,
-            type="expense",
-        )
-        _create_transaction(
-            date="2026-01-10",
-            amount=5000.00,
-            category_id=sample_income_category.id,
-            type="income",
-            transaction_type="income",
+        db_session.add_all(
+            [
+                Transaction(
+                    date="2026-01-10",
+                    amount=100.00,
+                    category_id=sample_category.id,
+                    type="expense",
+                    transaction_type="regular",
+                ),
+                Transaction(
+                    date="2026-01-10",
+                    amount=5000.00,
+                    category_id=sample_income_category.id,
+                    type="income",
+                    transaction_type="income",
+                ),
+            ]
         )
+        db_session.commit()
 
         all_txns = _list_transactions(month=1, year=2026)
         assert len(all_txns) == 2
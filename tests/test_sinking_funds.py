@@ -34,7 +34,7 @@ class TestSinkingFundsPageGet:
         assert 'name="color"' in response.text
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/sinking-funds", follow_redirects=False)
+        response = client.get("/sinking-funds")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -48,7 +48,7 @@ class TestSinkingFundsPagePost:
                 "description": "For emergencies",
                 "color": "#FF5733",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         fund = (
@@ -67,7 +67,7 @@ class TestSinkingFundsPagePost:
                 "name": "Holiday",
                 "color": "#00AAFF",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Holiday" in response.text
@@ -81,7 +81,7 @@ class TestSinkingFundsPagePost:
                 "name": "",
                 "color": "#FF0000",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "required" in response.text.lower()
@@ -93,7 +93,7 @@ class TestSinkingFundsPagePost:
                 "name": "Test",
                 "color": "",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "required" in response.text.lower()
@@ -105,7 +105,7 @@ class TestSinkingFundsPagePost:
                 "name": "New Fund",
                 "color": "#123456",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         fund = (
             db_session.query(SinkingFund).filter(SinkingFund.name == "New Fund").first()
@@ -121,7 +121,7 @@ class TestSinkingFundsPagePost:
                 "current_balance": "250.00",
                 "color": "#AABB00",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         fund = (
@@ -138,7 +138,7 @@ class TestSinkingFundsPagePost:
                 "current_balance": "-120.50",
                 "color": "#FF0000",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         fund = (
@@ -157,7 +157,7 @@ class TestSinkingFundsPagePost:
                 "current_balance": "xyz",
                 "color": "#FF0000",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "Invalid" in response.text
@@ -196,7 +196,7 @@ class TestSinkingFundsEditPost:
                 "description": "Updated description",
                 "color": "#AABBCC",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         db_session.refresh(fund)
@@ -212,7 +212,7 @@ class TestSinkingFundsEditPost:
                 "name": "Updated Bills",
                 "color": "#AABBCC",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert "Updated Bills" in response.text
 
@@ -220,7 +220,7 @@ class TestSinkingFundsEditPost:
         response = authed_client.post(
             "/sinking-funds/99999",
             data={"name": "X"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -230,7 +230,7 @@ class TestSinkingFundsDelete:
         fund = sample_sinking_funds[0]
         response = authed_client.delete(
             f"/sinking-funds/{fund.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         db_session.refresh(fund)
@@ -240,14 +240,16 @@ class TestSinkingFundsDelete:
         fund = sample_sinking_funds[0]
         response = authed_client.delete(
             f"/sinking-funds/{fund.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
+        # htmx skips the swap on 204, so hx-swap="delete" needs a 200
+        assert response.status_code == 200
         assert response.text == ""
 
     def test_404_for_nonexistent_fund(self, authed_client):
         response = authed_client.delete(
             "/sinking-funds/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -264,7 +266,7 @@ class TestSinkingFundsDelete:
         db_session.commit()
         response = authed_client.delete(
             f"/sinking-funds/{fund.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 400
         assert "cannot be deleted" in response.text
@@ -294,7 +296,7 @@ class TestApiFundsList:
         assert data[0]["name"] == "Savings"
 
     def test_unauthenticated_redirects(self, client):
-        response = client.get("/api/sinking-funds", follow_redirects=False)
+        response = client.get("/api/sinking-funds")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -308,7 +310,7 @@ class TestApiFundsCreate:
                 "description": "Holiday savings",
                 "color": "#FF5733",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
@@ -324,7 +326,7 @@ class TestApiFundsCreate:
                 "current_balance": "500.00",
                 "color": "#00FF00",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
@@ -338,7 +340,7 @@ class TestApiFundsCreate:
                 "current_balance": "-200.00",
                 "color": "#FF0000",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
@@ -348,7 +350,7 @@ class TestApiFundsCreate:
         response = authed_client.post(
             "/api/sinking-funds",
             json={"name": ""},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -386,7 +388,7 @@ class TestApiFundsUpdate:
         response = authed_client.put(
             f"/api/sinking-funds/{fund.id}",
             json={"name": "Updated Bills"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         data = response.json()
@@ -396,7 +398,7 @@ class TestApiFundsUpdate:
         response = authed_client.put(
             "/api/sinking-funds/99999",
             json={"name": "X"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -405,7 +407,7 @@ class TestApiFundsUpdate:
         response = authed_client.put(
             f"/api/sinking-funds/{fund.id}",
             json={"color": "not-a-color"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -417,7 +419,7 @@ class TestApiFundsDelete:
         fund = sample_sinking_funds[0]
         response = authed_client.delete(
             f"/api/sinking-funds/{fund.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         db_session.refresh(fund)
@@ -426,7 +428,7 @@ class TestApiFundsDelete:
     def test_404_for_nonexistent(self, authed_client):
         response = authed_client.delete(
             "/api/sinking-funds/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -438,7 +440,7 @@ class TestApiFundsDelete:
         db_session.commit()
         response = authed_client.delete(
             f"/api/sinking-funds/{fund.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 400
         assert "cannot be deleted" in response.json()["detail"]
@@ -542,7 +544,7 @@ class TestSinkingFundDetail:
 
     def test_unauthenticated_redirects(self, client, sample_sinking_funds):
         fund = sample_sinking_funds[0]
-        response = client.get(f"/sinking-funds/{fund.id}", follow_redirects=False)
+        response = client.get(f"/sinking-funds/{fund.id}")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -12,7 +12,7 @@ class TestSpendingHistoryPage:
         assert "Spending History" in response.text
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/spending-history", follow_redirects=False)
+        response = client.get("/spending-history")
         assert response.status_code == 303
         assert "/login" in response.headers["location"]
 
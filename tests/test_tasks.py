@@ -1,14 +1,10 @@
 """Tests for background tasks (income allocation and bill processing)."""
 
-import os
-
-os.environ["DATABASE_URL"] = "sqlite:///./test-glow-worm.db"
-
 from datetime import date
 from decimal import Decimal
-from unittest.mock import patch
 
 import pytest
+from sqlalchemy import select
 
 from app.models import (
     Budget,
@@ -30,47 +26,86 @@ from app.tasks import advance_due_date, process_due_bills, process_income_alloca
 
 
 class TestAdvanceDueDate:
-    def test_monthly(self):
-        assert advance_due_date(date(2026, 1, 15), "monthly") == date(2026, 2, 15)
-
-    def test_monthly_clamp_to_shorter_month(self):
-        # Jan 31 -> Feb 28 (non-leap year 2026)
-        assert advance_due_date(date(2026, 1, 31), "monthly") == date(2026, 2, 28)
-
-    def test_monthly_leap_year(self):
-        # Jan 31 -> Feb 29 (leap year 2028)
-        assert advance_due_date(date(2028, 1, 31), "monthly") == date(2028, 2, 29)
+    @pytest.mark.parametrize(
+        "start,frequency,expected",
+        [
+            pytest.param(date(2026, 1, 15), "monthly", date(2026, 2, 15), id="monthly"),
+            # Jan 31 -> Feb 28 (non-leap year 2026)
+            pytest.param(
+                date(2026, 1, 31),
+                "monthly",
+                date(2026, 2, 28),
+                id="monthly_clamp_to_shorter_month",
+            ),
+            # Jan 31 -> Feb 29 (leap year 2028)
+            pytest.param(
+                date(2028, 1, 31), "monthly", date(2028, 2, 29), id="monthly_leap_year"
+            ),
+            pytest.param(
+                date(2026, 12, 15),
+                "monthly",
+                date(2027, 1, 15),
+                id="monthly_december_to_january",
+            ),
+            pytest.param(
+                date(2026, 1, 15), "quarterly", date(2026, 4, 15), id="quarterly"
+            ),
+            pytest.param(
+                date(2026, 11, 15),
+                "quarterly",
+                date(2027, 2, 15),
+                id="quarterly_wrap_year",
+            ),
+            # Nov 30 + 3 months = Feb 28 (non-leap 2027)
+            pytest.param(
+                date(2026, 11, 30), "quarterly", date(2027, 2, 28), id="quarterly_clamp"
+            ),
+            pytest.param(date(2026, 3, 15), "yearly", date(2027, 3, 15), id="yearly"),
+            # Feb 29, 2028 (leap) -> Feb 28, 2029 (non-leap)
+            pytest.param(
+                date(2028, 2, 29), "yearly", date(2029, 2, 28), id="yearly_leap_day"
+            ),
+            pytest.param(date(2026, 1, 1), "28_days", date(2026, 1, 29), id="28_days"),
+            pytest.param(
+                date(2026, 1, 15),
+                "28_days",
+                date(2026, 2, 12),
+                id="28_days_crosses_month",
+            ),
+        ],
+    )
+    def test_advance_due_date(self, start, frequency, expected):
+        assert advance_due_date(start, frequency) == expected
 
-    def test_monthly_december_to_january(self):
-        assert advance_due_date(date(2026, 12, 15), "monthly") == date(2027, 1, 15)
 
-    def test_quarterly(self):
-        assert advance_due_date(date(2026, 1, 15), "quarterly") == date(2026, 4, 15)
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
 
-    def test_quarterly_wrap_year(self):
-        assert advance_due_date(date(2026, 11, 15), "quarterly") == date(2027, 2, 15)
 
-    def test_quarterly_clamp(self):
-        # Nov 30 + 3 months = Feb 28 (non-leap 2027)
-        assert advance_due_date(date(2026, 11, 30), "quarterly") == date(2027, 2, 28)
+def _assert_idempotent(task, db_session):
+    """Run *task* twice and assert the second run writes no transactions."""
+    task(db=db_session)
+    first_count = db_session.query(Transaction).count()
+    task(db=db_session)
+    assert db_session.query(Transaction).count() == first_count
 
-    def test_yearly(self):
-        assert advance_due_date(date(2026, 3, 15), "yearly") == date(2027, 3, 15)
 
-    def test_yearly_leap_day(self):
-        # Feb 29, 2028 (leap) -> Feb 28, 2029 (non-leap)
-        assert advance_due_date(date(2028, 2, 29), "yearly") == date(2029, 2, 28)
+def _balance(db_session, fund_id) -> Decimal:
+    """Read a fund's current balance with a single-column SELECT."""
+    return db_session.scalar(
+        select(SinkingFund.current_balance).where(SinkingFund.id == fund_id)
+    )
 
-    def test_28_days(self):
-        assert advance_due_date(date(2026, 1, 1), "28_days") == date(2026, 1, 29)
 
-    def test_28_days_crosses_month(self):
-        assert advance_due_date(date(2026, 1, 15), "28_days") == date(2026, 2, 12)
+@pytest.fixture
+def set_today(monkeypatch):
+    """Return a setter that pins app.tasks._today to a fixed date."""
 
+    def _set(today: date) -> None:
+        monkeypatch.setattr("app.tasks._today", lambda: today)
 
-# ---------------------------------------------------------------------------
-# Fixtures
-# ---------------------------------------------------------------------------
+    return _set
 
 
 @pytest.fixture
@@ -82,13 +117,9 @@ def income_setup(db_session):
     budget_cat = Category(
         name="Groceries", type="expense", color="#22C55E", is_budget_category=True
     )
-    db_session.add_all([income_cat, expense_cat, transfer_cat, budget_cat])
-    db_session.flush()
 
     bills_fund = SinkingFund(name="Bills", color="#FF0000", current_balance=500)
     savings_fund = SinkingFund(name="Savings", color="#00FF00", current_balance=1000)
-    db_session.add_all([bills_fund, savings_fund])
-    db_session.flush()
 
     # Recurring bill for recommended calculation: $1200/mo -> annual $14400 -> rec $1200
     bill = RecurringBill(
@@ -97,27 +128,38 @@ def income_setup(db_session):
         debtor_provider="Landlord",
         start_date="2026-01-01",
         frequency="monthly",
-        category_id=expense_cat.id,
+        category=expense_cat,
         next_due_date="2026-02-01",
     )
-    db_session.add(bill)
-    db_session.flush()
 
     allocation = IncomeAllocation(
         monthly_income_amount=5000,
         monthly_budget_allocation=800,
         bills_fund_allocation_type="recommended",
     )
-    db_session.add(allocation)
-    db_session.flush()
 
     # Junction: allocate $500 to Savings fund
     junction = IncomeAllocationToSinkingFund(
-        income_allocation_id=allocation.id,
-        sinking_fund_id=savings_fund.id,
+        income_allocation=allocation,
+        sinking_fund=savings_fund,
         allocation_amount=500,
     )
-    db_session.add(junction)
+
+    # Foreign keys are wired through relationships, so one commit inserts
+    # the whole graph in dependency order
+    db_session.add_all(
+        [
+            income_cat,
+            expense_cat,
+            transfer_cat,
+            budget_cat,
+            bills_fund,
+            savings_fund,
+            bill,
+            allocation,
+            junction,
+        ]
+    )
     db_session.commit()
 
     return {
@@ -136,12 +178,7 @@ def income_setup(db_session):
 def bills_setup(db_session):
     """Set up a bill processing scenario."""
     expense_cat = Category(name="Bills", type="expense", color="#FF0000")
-    db_session.add(expense_cat)
-    db_session.flush()
-
     bills_fund = SinkingFund(name="Bills", color="#FF0000", current_balance=5000)
-    db_session.add(bills_fund)
-    db_session.flush()
 
     bill_due = RecurringBill(
         name="Rent",
@@ -149,7 +186,7 @@ def bills_setup(db_session):
         debtor_provider="Landlord",
         start_date="2026-01-01",
         frequency="monthly",
-        category_id=expense_cat.id,
+        category=expense_cat,
         next_due_date="2026-02-01",
     )
     bill_future = RecurringBill(
@@ -158,10 +195,10 @@ def bills_setup(db_session):
         debtor_provider="Insurer",
         start_date="2026-01-01",
         frequency="quarterly",
-        category_id=expense_cat.id,
+        category=expense_cat,
         next_due_date="2026-04-01",
     )
-    db_session.add_all([bill_due, bill_future])
+    db_session.add_all([expense_cat, bills_fund, bill_due, bill_future])
     db_session.commit()
 
     return {
@@ -178,9 +215,10 @@ def bills_setup(db_session):
 
 
 class TestProcessIncomeAllocation:
-    @patch("app.tasks._today")
-    def test_happy_path(self, mock_today, db_session, income_setup):
-        mock_today.return_value = date(2026, 2, 1)
+    def test_happy_path(self, set_today, db_session, income_setup):
+        set_today(date(2026, 2, 1))
+        savings_fund_id = income_setup["savings_fund"].id
+        bills_fund_id = income_setup["bills_fund"].id
 
         process_income_allocation(db=db_session)
 
@@ -191,7 +229,7 @@ class TestProcessIncomeAllocation:
             .first()
         )
         assert income_txn is not None
-        assert Decimal(str(income_txn.amount)) == Decimal("5000")
+        assert income_txn.amount == Decimal("5000")
         assert income_txn.type == "income"
 
         # Savings fund allocation transaction
@@ -204,15 +242,12 @@ class TestProcessIncomeAllocation:
             .all()
         )
         assert len(savings_txns) == 1
-        assert Decimal(str(savings_txns[0].amount)) == Decimal("500")
+        assert savings_txns[0].amount == Decimal("500")
         assert savings_txns[0].type == "transfer"
         assert savings_txns[0].category_id == income_setup["transfer_cat"].id
 
         # Savings fund balance increased: 1000 + 500 = 1500
-        db_session.refresh(income_setup["savings_fund"])
-        assert Decimal(str(income_setup["savings_fund"].current_balance)) == Decimal(
-            "1500"
-        )
+        assert _balance(db_session, savings_fund_id) == Decimal("1500")
 
         # Bills fund allocation (recommended = 1200 * 12 / 12 = 1200.00)
         bills_txns = (
@@ -224,15 +259,12 @@ class TestProcessIncomeAllocation:
             .all()
         )
         assert len(bills_txns) == 1
-        assert Decimal(str(bills_txns[0].amount)) == Decimal("1200.00")
+        assert bills_txns[0].amount == Decimal("1200.00")
         assert bills_txns[0].type == "transfer"
         assert bills_txns[0].category_id == income_setup["transfer_cat"].id
 
         # Bills fund balance increased: 500 + 1200 = 1700
-        db_session.refresh(income_setup["bills_fund"])
-        assert Decimal(str(income_setup["bills_fund"].current_balance)) == Decimal(
-            "1700"
-        )
+        assert _balance(db_session, bills_fund_id) == Decimal("1700")
 
         # Budget row created for Groceries
         budget = (
@@ -256,34 +288,29 @@ class TestProcessIncomeAllocation:
             .first()
         )
         assert unalloc is not None
-        assert Decimal(str(unalloc.unallocated_amount)) == Decimal("2500")
+        assert unalloc.unallocated_amount == Decimal("2500")
 
-    @patch("app.tasks._today")
-    def test_idempotent(self, mock_today, db_session, income_setup):
-        mock_today.return_value = date(2026, 2, 1)
+    def test_idempotent(self, set_today, db_session, income_setup):
+        set_today(date(2026, 2, 1))
 
-        process_income_allocation(db=db_session)
-        process_income_allocation(db=db_session)
+        _assert_idempotent(process_income_allocation, db_session)
 
-        income_txns = (
+        income_count = (
             db_session.query(Transaction)
             .filter(Transaction.transaction_type == "income")
-            .all()
+            .count()
         )
-        assert len(income_txns) == 1
+        assert income_count == 1
 
-    @patch("app.tasks._today")
-    def test_no_config(self, mock_today, db_session):
-        mock_today.return_value = date(2026, 2, 1)
+    def test_no_config(self, set_today, db_session):
+        set_today(date(2026, 2, 1))
 
         process_income_allocation(db=db_session)
 
-        txns = db_session.query(Transaction).all()
-        assert len(txns) == 0
+        assert db_session.query(Transaction).count() == 0
 
-    @patch("app.tasks._today")
-    def test_fixed_bills_allocation(self, mock_today, db_session, income_setup):
-        mock_today.return_value = date(2026, 3, 1)
+    def test_fixed_bills_allocation(self, set_today, db_session, income_setup):
+        set_today(date(2026, 3, 1))
 
         # Switch to fixed allocation
         alloc = db_session.query(IncomeAllocation).first()
@@ -302,11 +329,10 @@ class TestProcessIncomeAllocation:
             .first()
         )
         assert bills_txn is not None
-        assert Decimal(str(bills_txn.amount)) == Decimal("900")
+        assert bills_txn.amount == Decimal("900")
 
-    @patch("app.tasks._today")
     def test_budget_carries_forward_allocated_amount(
-        self, mock_today, db_session, income_setup
+        self, set_today, db_session, income_setup
     ):
         """Budget allocated_amount should be copied from previous month's budget."""
         # Seed a January budget row with a known allocated amount
@@ -322,7 +348,7 @@ class TestProcessIncomeAllocation:
         )
         db_session.commit()
 
-        mock_today.return_value = date(2026, 2, 1)
+        set_today(date(2026, 2, 1))
         process_income_allocation(db=db_session)
 
         budget = (
@@ -335,14 +361,13 @@ class TestProcessIncomeAllocation:
             .first()
         )
         assert budget is not None
-        assert Decimal(str(budget.allocated_amount)) == Decimal("350")
+        assert budget.allocated_amount == Decimal("350")
 
-    @patch("app.tasks._today")
     def test_budget_defaults_to_zero_when_no_previous_month(
-        self, mock_today, db_session, income_setup
+        self, set_today, db_session, income_setup
     ):
         """Budget allocated_amount defaults to 0 when no prior month budget exists."""
-        mock_today.return_value = date(2026, 2, 1)
+        set_today(date(2026, 2, 1))
         process_income_allocation(db=db_session)
 
         budget = (
@@ -355,14 +380,13 @@ class TestProcessIncomeAllocation:
             .first()
         )
         assert budget is not None
-        assert Decimal(str(budget.allocated_amount)) == Decimal("0")
+        assert budget.allocated_amount == Decimal("0")
 
-    @patch("app.tasks._today")
     def test_process_income_allocation_creates_transfer_transactions(
-        self, mock_today, db_session, income_setup
+        self, set_today, db_session, income_setup
     ):
         """Recurring transfers produce expense transactions with income_allocation type."""
-        mock_today.return_value = date(2026, 2, 1)
+        set_today(date(2026, 2, 1))
 
         allocation = income_setup["allocation"]
         db_session.add(
@@ -385,16 +409,15 @@ class TestProcessIncomeAllocation:
             .all()
         )
         assert len(transfer_txns) == 1
-        assert Decimal(str(transfer_txns[0].amount)) == Decimal("200")
+        assert transfer_txns[0].amount == Decimal("200")
         assert "Monthly transfer out" in transfer_txns[0].description
         assert transfer_txns[0].category_id == income_setup["transfer_cat"].id
 
-    @patch("app.tasks._today")
     def test_transfer_amount_deducted_from_unallocated(
-        self, mock_today, db_session, income_setup
+        self, set_today, db_session, income_setup
     ):
         """Recurring transfer amounts reduce the unallocated remainder."""
-        mock_today.return_value = date(2026, 2, 1)
+        set_today(date(2026, 2, 1))
 
         allocation = income_setup["allocation"]
         db_session.add(
@@ -419,7 +442,7 @@ class TestProcessIncomeAllocation:
             .first()
         )
         assert unalloc is not None
-        assert Decimal(str(unalloc.unallocated_amount)) == Decimal("2200")
+        assert unalloc.unallocated_amount == Decimal("2200")
 
 
 # ---------------------------------------------------------------------------
@@ -427,10 +450,12 @@ class TestProcessIncomeAllocation:
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.slow
+@pytest.mark.xdist_group("scheduler")
 class TestProcessDueBills:
-    @patch("app.tasks._today")
-    def test_processes_due_bill(self, mock_today, db_session, bills_setup):
-        mock_today.return_value = date(2026, 2, 1)
+    def test_processes_due_bill(self, set_today, db_session, bills_setup):
+        set_today(date(2026, 2, 1))
+        fund_id = bills_setup["bills_fund"].id
 
         process_due_bills(db=db_session)
 
@@ -441,61 +466,52 @@ class TestProcessDueBills:
             .all()
         )
         assert len(txns) == 1
-        assert Decimal(str(txns[0].amount)) == Decimal("2400")
+        assert txns[0].amount == Decimal("2400")
         assert txns[0].sinking_fund_id == bills_setup["bills_fund"].id
 
         # Fund balance decreased: 5000 - 2400 = 2600
-        db_session.refresh(bills_setup["bills_fund"])
-        assert Decimal(str(bills_setup["bills_fund"].current_balance)) == Decimal(
-            "2600"
-        )
+        assert _balance(db_session, fund_id) == Decimal("2600")
 
         # next_due_date advanced: 2026-02-01 + monthly = 2026-03-01
         db_session.refresh(bills_setup["bill_due"])
         assert bills_setup["bill_due"].next_due_date == "2026-03-01"
 
-    @patch("app.tasks._today")
-    def test_skips_future_bill(self, mock_today, db_session, bills_setup):
-        mock_today.return_value = date(2026, 2, 1)
+    def test_skips_future_bill(self, set_today, db_session, bills_setup):
+        set_today(date(2026, 2, 1))
 
         process_due_bills(db=db_session)
 
         # No transaction for future bill (due 2026-04-01)
-        txns = (
+        future_count = (
             db_session.query(Transaction)
             .filter(Transaction.recurring_bill_id == bills_setup["bill_future"].id)
-            .all()
+            .count()
         )
-        assert len(txns) == 0
+        assert future_count == 0
 
-    @patch("app.tasks._today")
-    def test_idempotent(self, mock_today, db_session, bills_setup):
-        mock_today.return_value = date(2026, 2, 1)
+    def test_idempotent(self, set_today, db_session, bills_setup):
+        set_today(date(2026, 2, 1))
 
-        process_due_bills(db=db_session)
-        process_due_bills(db=db_session)
+        _assert_idempotent(process_due_bills, db_session)
 
-        txns = (
+        due_count = (
             db_session.query(Transaction)
             .filter(Transaction.recurring_bill_id == bills_setup["bill_due"].id)
-            .all()
+            .count()
         )
-        assert len(txns) == 1
+        assert due_count == 1
 
-    @patch("app.tasks._today")
-    def test_no_bills_fund(self, mock_today, db_session):
-        mock_today.return_value = date(2026, 2, 1)
+    def test_no_bills_fund(self, set_today, db_session):
+        set_today(date(2026, 2, 1))
 
         # No Bills fund exists
         process_due_bills(db=db_session)
 
-        txns = db_session.query(Transaction).all()
-        assert len(txns) == 0
+        assert db_session.query(Transaction).count() == 0
 
-    @patch("app.tasks._today")
-    def test_overdue_bill(self, mock_today, db_session, bills_setup):
+    def test_overdue_bill(self, set_today, db_session, bills_setup):
         """Bills overdue by several days should still be processed."""
-        mock_today.return_value = date(2026, 2, 5)
+        set_today(date(2026, 2, 5))
 
         process_due_bills(db=db_session)
 
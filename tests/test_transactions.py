@@ -1,3 +1,5 @@
+import pytest
+
 from app.models import Transaction
 from app.routes.transactions import PAGE_SIZE
 
@@ -58,7 +60,7 @@ class TestTransactionsPageGet:
         assert "4,924.50" in response.text  # net
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/transactions", follow_redirects=False)
+        response = client.get("/transactions")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -145,7 +147,7 @@ class TestTransactionsPagePost:
                 "month": "1",
                 "year": "2026",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         txn = (
@@ -156,85 +158,43 @@ class TestTransactionsPagePost:
         assert txn is not None
         assert float(txn.amount) == 42.99
 
-    def test_error_on_missing_date(self, authed_client, sample_category):
-        response = authed_client.post(
-            "/transactions",
-            data={
-                "date": "",
-                "amount": "10.00",
-                "category_id": str(sample_category.id),
-                "type": "expense",
-                "month": "1",
-                "year": "2026",
-            },
-            headers={"x-csrftoken": authed_client.csrf_token},
-        )
-        assert response.status_code == 200
-        assert "required" in response.text.lower()
-
-    def test_error_on_missing_category(self, authed_client):
-        response = authed_client.post(
-            "/transactions",
-            data={
-                "date": "2026-01-20",
-                "amount": "10.00",
-                "category_id": "",
-                "type": "expense",
-                "month": "1",
-                "year": "2026",
-            },
-            headers={"x-csrftoken": authed_client.csrf_token},
-        )
-        assert response.status_code == 200
-        assert "required" in response.text.lower()
-
-    def test_error_on_invalid_amount(self, authed_client, sample_category):
-        response = authed_client.post(
-            "/transactions",
-            data={
-                "date": "2026-01-20",
-                "amount": "abc",
-                "category_id": str(sample_category.id),
-                "type": "expense",
-                "month": "1",
-                "year": "2026",
-            },
-            headers={"x-csrftoken": authed_client.csrf_token},
-        )
-        assert response.status_code == 200
-        assert "Invalid" in response.text
-
-    def test_error_on_zero_amount(self, authed_client, sample_category):
-        response = authed_client.post(
-            "/transactions",
-            data={
-                "date": "2026-01-20",
-                "amount": "0",
-                "category_id": str(sample_category.id),
-                "type": "expense",
-                "month": "1",
-                "year": "2026",
-            },
-            headers={"x-csrftoken": authed_client.csrf_token},
-        )
-        assert response.status_code == 200
-        assert "greater than zero" in response.text.lower()
-
-    def test_error_on_invalid_type(self, authed_client, sample_category):
+    @pytest.mark.parametrize(
+        "overrides,message",
+        [
+            pytest.param({"date": ""}, "Date is required.", id="missing_date"),
+            pytest.param(
+                {"category_id": ""}, "Category is required.", id="missing_category"
+            ),
+            pytest.param({"amount": "abc"}, "Invalid amount.", id="invalid_amount"),
+            pytest.param(
+                {"amount": "0"}, "Amount must be greater than zero.", id="zero_amount"
+            ),
+            pytest.param(
+                {"type": "invalid"},
+                "Type must be income or expense.",
+                id="invalid_type",
+            ),
+        ],
+    )
+    def test_validation_errors(
+        self, authed_client, sample_category, overrides, message
+    ):
+        data = {
+            "date": "2026-01-20",
+            "amount": "10.00",
+            "category_id": str(sample_category.id),
+            "type": "expense",
+            "month": "1",
+            "year": "2026",
+            **overrides,
+        }
         response = authed_client.post(
             "/transactions",
-            data={
-                "date": "2026-01-20",
-                "amount": "10.00",
-                "category_id": str(sample_category.id),
-                "type": "invalid",
-                "month": "1",
-                "year": "2026",
-            },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            data=data,
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        assert "income or expense" in response.text.lower()
+        assert message in response.text
 
     def test_creates_with_linked_entities(
         self,
@@ -259,7 +219,7 @@ class TestTransactionsPagePost:
                 "month": "1",
                 "year": "2026",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         txn = (
@@ -305,7 +265,7 @@ class TestTransactionsEditPost:
         response = authed_client.post(
             f"/transactions/{txn.id}",
             data={"amount": "99.99", "description": "Updated desc"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         db_session.refresh(txn)
@@ -317,7 +277,7 @@ class TestTransactionsEditPost:
         response = authed_client.post(
             f"/transactions/{txn.id}",
             data={"amount": "99.99"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert "99.99" in response.text
 
@@ -331,7 +291,7 @@ class TestTransactionsEditPost:
         response = authed_client.post(
             f"/transactions/{txn.id}",
             data={"sinking_fund_id": ""},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         db_session.refresh(txn)
@@ -341,7 +301,7 @@ class TestTransactionsEditPost:
         response = authed_client.post(
             "/transactions/99999",
             data={"amount": "10.00"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -354,27 +314,23 @@ class TestTransactionsDelete:
         txn_id = txn.id
         response = authed_client.delete(
             f"/transactions/{txn_id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        db_session.expire_all()
-        assert (
-            db_session.query(Transaction).filter(Transaction.id == txn_id).first()
-            is None
-        )
+        assert db_session.get(Transaction, txn_id) is None
 
     def test_returns_empty_response(self, authed_client, sample_transactions):
         txn = sample_transactions[0]
         response = authed_client.delete(
             f"/transactions/{txn.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.text == ""
 
     def test_404_for_nonexistent(self, authed_client):
         response = authed_client.delete(
             "/transactions/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -408,7 +364,7 @@ class TestApiTransactionsList:
         assert data[0]["type"] == "expense"
 
     def test_unauthenticated_redirects(self, client):
-        response = client.get("/api/transactions", follow_redirects=False)
+        response = client.get("/api/transactions")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -425,7 +381,7 @@ class TestApiTransactionsCreate:
                 "type": "expense",
                 "transaction_type": "regular",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
@@ -436,7 +392,7 @@ class TestApiTransactionsCreate:
         response = authed_client.post(
             "/api/transactions",
             json={"date": "bad-date"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -476,7 +432,7 @@ class TestApiTransactionsUpdate:
         response = authed_client.put(
             f"/api/transactions/{txn.id}",
             json={"amount": "120.00", "description": "Updated via API"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         data = response.json()
@@ -487,7 +443,7 @@ class TestApiTransactionsUpdate:
         response = authed_client.put(
             "/api/transactions/99999",
             json={"amount": "10.00"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -496,7 +452,7 @@ class TestApiTransactionsUpdate:
         response = authed_client.put(
             f"/api/transactions/{txn.id}",
             json={"amount": "-10"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -509,18 +465,14 @@ class TestApiTransactionsDelete:
         txn_id = txn.id
         response = authed_client.delete(
             f"/api/transactions/{txn_id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        db_session.expire_all()
-        assert (
-            db_session.query(Transaction).filter(Transaction.id == txn_id).first()
-            is None
-        )
+        assert db_session.get(Transaction, txn_id) is None
 
     def test_404_for_nonexistent(self, authed_client):
         response = authed_client.delete(
             "/api/transactions/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
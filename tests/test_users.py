@@ -1,17 +1,33 @@
-import json
+import pytest
+from sqlalchemy import select
 
 from app.auth import verify_password
 from app.models import User
+from tests.conftest import assert_contains_all, count_selects
+
+# Placeholder with a bcrypt hash's length; bob never logs in
+_FAKE_HASH = "x" * 60
+
+
+def _user_column(db_session, user_id, column):
+    """Read a single User column with a one-column SELECT."""
+    return db_session.scalar(select(column).where(User.id == user_id))
+
+
+@pytest.fixture
+def bob_user(db_session):
+    """A second user, flushed so it has a primary key without a commit."""
+    user = User(username="bob", password_hash=_FAKE_HASH, email=None)
+    db_session.add(user)
+    db_session.flush()
+    return user
 
 
 class TestUsersPageGet:
     def test_renders_page_with_table(self, authed_client):
         response = authed_client.get("/users")
         assert response.status_code == 200
-        assert "Users" in response.text
-        assert "Username" in response.text
-        assert "Email" in response.text
-        assert "Actions" in response.text
+        assert_contains_all(response.text, {"Users", "Username", "Email", "Actions"})
 
     def test_lists_existing_user(self, authed_client, test_user):
         response = authed_client.get("/users")
@@ -19,7 +35,7 @@ class TestUsersPageGet:
         assert "alice" in response.text
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/users", follow_redirects=False)
+        response = client.get("/users")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"
 
@@ -31,6 +47,14 @@ class TestUsersPageGet:
         # There's only one user (alice), so no delete buttons should appear
         assert "Delete this user?" not in response.text
 
+    @pytest.mark.parametrize("path", ["/users", "/api/users"])
+    def test_listing_query_count(self, authed_client, bob_user, path):
+        with count_selects() as selects:
+            response = authed_client.get(path)
+        # session user, user list; not one per listed user
+        assert len(selects) <= 2, selects
+        assert response.status_code == 200
+
 
 class TestUsersPageCreate:
     def test_creates_user(self, authed_client, db_session):
@@ -41,70 +65,74 @@ class TestUsersPageCreate:
                 "password": "Password123!",
                 "email": "bob@example.com",
             },
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "bob" in response.text
 
-        user = db_session.query(User).filter(User.username == "bob").first()
-        assert user is not None
-        assert user.email == "bob@example.com"
+        email = db_session.scalar(select(User.email).where(User.username == "bob"))
+        assert email == "bob@example.com"
 
     def test_creates_user_without_email(self, authed_client, db_session):
         response = authed_client.post(
             "/users",
             data={"username": "carol", "password": "Password123!"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "carol" in response.text
 
-    def test_rejects_empty_username(self, authed_client):
-        response = authed_client.post(
-            "/users",
-            data={"username": "", "password": "Password123!"},
-            headers={"x-csrftoken": authed_client.csrf_token},
-        )
-        assert response.status_code == 200
-        assert "Username is required" in response.text
-
-    def test_rejects_short_password(self, authed_client):
+    @pytest.mark.parametrize(
+        "data,message",
+        [
+            pytest.param(
+                {"username": "", "password": "Password123!"},
+                "Username is required",
+                id="empty_username",
+            ),
+            pytest.param(
+                {"username": "dave", "password": "short"},
+                "at least 8 characters",
+                id="short_password",
+            ),
+            # authed_client logs in as alice, so the name is already taken
+            pytest.param(
+                {"username": "alice", "password": "Password123!"},
+                "already exists",
+                id="duplicate_username",
+            ),
+        ],
+    )
+    def test_rejects_invalid_input(self, authed_client, data, message):
         response = authed_client.post(
             "/users",
-            data={"username": "dave", "password": "short"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            data=data,
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        assert "at least 8 characters" in response.text
-
-    def test_rejects_duplicate_username(self, authed_client, test_user):
-        response = authed_client.post(
-            "/users",
-            data={"username": "alice", "password": "Password123!"},
-            headers={"x-csrftoken": authed_client.csrf_token},
-        )
-        assert response.status_code == 200
-        assert "already exists" in response.text
+        assert message in response.text
 
     def test_password_is_hashed(self, authed_client, db_session):
         authed_client.post(
             "/users",
             data={"username": "eve", "password": "MySecret99"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
+        )
+        password_hash = db_session.scalar(
+            select(User.password_hash).where(User.username == "eve")
         )
-        user = db_session.query(User).filter(User.username == "eve").first()
-        assert user is not None
-        assert user.password_hash != "MySecret99"
-        assert verify_password("MySecret99", user.password_hash)
+        assert password_hash is not None
+        assert password_hash != "MySecret99"
+        assert verify_password("MySecret99", password_hash)
 
 
 class TestUsersPageEditForm:
     def test_returns_edit_row(self, authed_client, test_user):
         response = authed_client.get(f"/users/{test_user.id}/edit")
         assert response.status_code == 200
-        assert 'name="username"' in response.text
-        assert 'name="password"' in response.text
-        assert "alice" in response.text
+        assert_contains_all(
+            response.text, {'name="username"', 'name="password"', "alice"}
+        )
 
     def test_not_found(self, authed_client):
         response = authed_client.get("/users/99999/edit")
@@ -113,69 +141,66 @@ class TestUsersPageEditForm:
 
 class TestUsersPageUpdate:
     def test_updates_username(self, authed_client, test_user, db_session):
+        user_id = test_user.id
         response = authed_client.post(
-            f"/users/{test_user.id}",
+            f"/users/{user_id}",
             data={"username": "alice_updated", "email": "alice@example.com"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "alice_updated" in response.text
 
-        db_session.refresh(test_user)
-        assert test_user.username == "alice_updated"
+        assert _user_column(db_session, user_id, User.username) == "alice_updated"
 
     def test_updates_email(self, authed_client, test_user, db_session):
+        user_id = test_user.id
         response = authed_client.post(
-            f"/users/{test_user.id}",
+            f"/users/{user_id}",
             data={"username": "alice", "email": "newemail@example.com"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
 
-        db_session.refresh(test_user)
-        assert test_user.email == "newemail@example.com"
+        assert _user_column(db_session, user_id, User.email) == "newemail@example.com"
 
     def test_updates_password(self, authed_client, test_user, db_session):
+        user_id = test_user.id
         response = authed_client.post(
-            f"/users/{test_user.id}",
+            f"/users/{user_id}",
             data={"username": "alice", "password": "NewPassword456!"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
 
-        db_session.refresh(test_user)
-        assert verify_password("NewPassword456!", test_user.password_hash)
+        password_hash = _user_column(db_session, user_id, User.password_hash)
+        assert verify_password("NewPassword456!", password_hash)
 
     def test_blank_password_keeps_existing(self, authed_client, test_user, db_session):
+        user_id = test_user.id
         old_hash = test_user.password_hash
         authed_client.post(
-            f"/users/{test_user.id}",
+            f"/users/{user_id}",
             data={"username": "alice", "password": ""},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
-        db_session.refresh(test_user)
-        assert test_user.password_hash == old_hash
+        assert _user_column(db_session, user_id, User.password_hash) == old_hash
 
     def test_rejects_short_password_on_update(self, authed_client, test_user):
         response = authed_client.post(
             f"/users/{test_user.id}",
             data={"username": "alice", "password": "short"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "at least 8 characters" in response.text
 
     def test_rejects_duplicate_username_on_update(
-        self, authed_client, test_user, db_session
+        self, authed_client, test_user, bob_user
     ):
-        other = User(username="bob", password_hash="x" * 60, email=None)
-        db_session.add(other)
-        db_session.commit()
-
         response = authed_client.post(
             f"/users/{test_user.id}",
             data={"username": "bob"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "already exists" in response.text
@@ -184,29 +209,25 @@ class TestUsersPageUpdate:
         response = authed_client.post(
             "/users/99999",
             data={"username": "ghost"},
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
 
 class TestUsersPageDelete:
-    def test_deletes_other_user(self, authed_client, test_user, db_session):
-        other = User(username="bob", password_hash="x" * 60, email=None)
-        db_session.add(other)
-        db_session.commit()
-        db_session.refresh(other)
-
+    def test_deletes_other_user(self, authed_client, test_user, db_session, bob_user):
+        bob_id = bob_user.id
         response = authed_client.delete(
-            f"/users/{other.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            f"/users/{bob_id}",
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
-        assert db_session.query(User).filter(User.id == other.id).first() is None
+        assert db_session.get(User, bob_id) is None
 
     def test_cannot_delete_self(self, authed_client, test_user):
         response = authed_client.delete(
             f"/users/{test_user.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 400
         assert "Cannot delete your own account" in response.text
@@ -214,7 +235,7 @@ class TestUsersPageDelete:
     def test_not_found(self, authed_client):
         response = authed_client.delete(
             "/users/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
@@ -230,17 +251,12 @@ class TestApiUsers:
     def test_create_user(self, authed_client, db_session):
         response = authed_client.post(
             "/api/users",
-            content=json.dumps(
-                {
-                    "username": "frank",
-                    "password": "Secure1234",
-                    "email": "frank@example.com",
-                }
-            ),
-            headers={
-                "Content-Type": "application/json",
-                "x-csrftoken": authed_client.csrf_token,
+            json={
+                "username": "frank",
+                "password": "Secure1234",
+                "email": "frank@example.com",
             },
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 201
         data = response.json()
@@ -252,11 +268,8 @@ class TestApiUsers:
     def test_create_user_duplicate(self, authed_client, test_user):
         response = authed_client.post(
             "/api/users",
-            content=json.dumps({"username": "alice", "password": "Secure1234"}),
-            headers={
-                "Content-Type": "application/json",
-                "x-csrftoken": authed_client.csrf_token,
-            },
+            json={"username": "alice", "password": "Secure1234"},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 409
         assert "already exists" in response.json()["detail"]
@@ -264,11 +277,8 @@ class TestApiUsers:
     def test_create_user_validation_error(self, authed_client):
         response = authed_client.post(
             "/api/users",
-            content=json.dumps({"username": "x", "password": "short"}),
-            headers={
-                "Content-Type": "application/json",
-                "x-csrftoken": authed_client.csrf_token,
-            },
+            json={"username": "x", "password": "short"},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 422
 
@@ -285,64 +295,44 @@ class TestApiUsers:
     def test_update_user(self, authed_client, test_user, db_session):
         response = authed_client.put(
             f"/api/users/{test_user.id}",
-            content=json.dumps({"username": "alice_v2"}),
-            headers={
-                "Content-Type": "application/json",
-                "x-csrftoken": authed_client.csrf_token,
-            },
+            json={"username": "alice_v2"},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert response.json()["username"] == "alice_v2"
 
     def test_update_user_password(self, authed_client, test_user, db_session):
+        user_id = test_user.id
         response = authed_client.put(
-            f"/api/users/{test_user.id}",
-            content=json.dumps({"password": "BrandNew99!"}),
-            headers={
-                "Content-Type": "application/json",
-                "x-csrftoken": authed_client.csrf_token,
-            },
+            f"/api/users/{user_id}",
+            json={"password": "BrandNew99!"},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
 
-        db_session.refresh(test_user)
-        assert verify_password("BrandNew99!", test_user.password_hash)
-
-    def test_update_user_duplicate_username(self, authed_client, test_user, db_session):
-        other = User(username="bob", password_hash="x" * 60, email=None)
-        db_session.add(other)
-        db_session.commit()
+        password_hash = _user_column(db_session, user_id, User.password_hash)
+        assert verify_password("BrandNew99!", password_hash)
 
+    def test_update_user_duplicate_username(self, authed_client, test_user, bob_user):
         response = authed_client.put(
             f"/api/users/{test_user.id}",
-            content=json.dumps({"username": "bob"}),
-            headers={
-                "Content-Type": "application/json",
-                "x-csrftoken": authed_client.csrf_token,
-            },
+            json={"username": "bob"},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 409
 
     def test_update_user_not_found(self, authed_client):
         response = authed_client.put(
             "/api/users/99999",
-            content=json.dumps({"username": "ghost"}),
-            headers={
-                "Content-Type": "application/json",
-                "x-csrftoken": authed_client.csrf_token,
-            },
+            json={"username": "ghost"},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
-    def test_delete_user(self, authed_client, test_user, db_session):
-        other = User(username="bob", password_hash="x" * 60, email=None)
-        db_session.add(other)
-        db_session.commit()
-        db_session.refresh(other)
-
+    def test_delete_user(self, authed_client, test_user, bob_user):
         response = authed_client.delete(
-            f"/api/users/{other.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            f"/api/users/{bob_user.id}",
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 200
         assert "deleted" in response.json()["detail"]
@@ -350,7 +340,7 @@ class TestApiUsers:
     def test_delete_self_blocked(self, authed_client, test_user):
         response = authed_client.delete(
             f"/api/users/{test_user.id}",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 400
         assert "Cannot delete your own account" in response.json()["detail"]
@@ -358,11 +348,11 @@ class TestApiUsers:
     def test_delete_user_not_found(self, authed_client):
         response = authed_client.delete(
             "/api/users/99999",
-            headers={"x-csrftoken": authed_client.csrf_token},
+            headers=authed_client.csrf_headers,
         )
         assert response.status_code == 404
 
     def test_unauthenticated_redirects_to_login(self, client):
-        response = client.get("/api/users", follow_redirects=False)
+        response = client.get("/api/users")
         assert response.status_code == 303
         assert response.headers["location"] == "/login"